@@ -1,12 +1,73 @@
 #!/usr/bin/env python3
+from __future__ import annotations
+
 import os
+import re
 import sys
 import json
+import hashlib
+import time
 import argparse
-import requests
-from typing import Any, Dict, Optional, List
-
-TIMEOUT = 30
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, List, Tuple
+
+if TYPE_CHECKING:
+    import requests
+
+# orjson is optional: it encodes straight to bytes and parses several times
+# faster than the stdlib; fall back to json when it isn't installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# (connect, read) seconds: a dead host fails in ~3s; model lists are small,
+# while a chat reply may take a while to generate.
+HTTP_TIMEOUT = (3.05, 25)
+LIST_TIMEOUT = (3.05, 10)
+MODELS_CACHE_MAX_AGE = 3600  # seconds; model catalogs change rarely
+
+# One pooled session for every call: keep-alive reuses the TCP/TLS connection
+# between the list and chat requests, and --all shares the pool across threads.
+# Only idempotent GETs (model lists) are retried on transient gateway errors;
+# a retried chat POST could be billed twice.
+# requests (with urllib3, certifi, idna, ...) is imported on first use so that
+# --help and argument errors don't pay for it.
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+def session() -> requests.Session:
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+
+                s = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=16,
+                    pool_maxsize=32,
+                    max_retries=Retry(
+                        total=2,
+                        backoff_factor=0.5,
+                        status_forcelist=(502, 503, 504),
+                        allowed_methods=frozenset({"GET", "HEAD"}),
+                        raise_on_status=False,
+                    ),
+                )
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                _SESSION = s
+    return _SESSION
+
+def request_errors() -> tuple:
+    """Exceptions a provider call may raise; resolves requests lazily."""
+    import requests
+    return (LLMError, requests.RequestException)
 
 # -----------------------------------------------------------------------------
 # Provider registry
@@ -71,9 +132,9 @@ PROVIDERS: Dict[str, Dict[str, Any]] = {
         "base_url": "https://openrouter.ai/api/v1",
         "api_key_env": "OPENROUTER_API_KEY",
         "extra_headers": {
-            # Optional but recommended by OpenRouter
-            "HTTP-Referer": os.environ.get("OPENROUTER_HTTP_REFERER", ""),
-            "X-Title": os.environ.get("OPENROUTER_X_TITLE", "gitar-llm-test"),
+            # Optional but recommended by OpenRouter; header -> (env var, default)
+            "HTTP-Referer": ("OPENROUTER_HTTP_REFERER", ""),
+            "X-Title": ("OPENROUTER_X_TITLE", "gitar-llm-test"),
         },
     },
     "ollama": {
@@ -97,21 +158,147 @@ PROVIDERS: Dict[str, Dict[str, Any]] = {
     },
 }
 
+# Endpoint URLs per provider type, resolved once against each base_url.
+# Gemini's chat URL depends on the model, so only its prefix is stored.
+ENDPOINTS: Dict[str, Dict[str, str]] = {
+    "openai_compat": {"models_url": "/models", "chat_url": "/chat/completions"},
+    "anthropic": {"models_url": "/v1/models", "chat_url": "/v1/messages"},
+    "gemini": {"models_url": "/v1beta/models", "model_prefix": "/v1beta/models/"},
+}
+for _cfg in PROVIDERS.values():
+    _base = _cfg["base_url"].rstrip("/")
+    for _key, _path in ENDPOINTS[_cfg["type"]].items():
+        _cfg[_key] = _base + _path
+
 # -----------------------------------------------------------------------------
 # Utilities
 # -----------------------------------------------------------------------------
-def die(msg: str, code: int = 1) -> None:
-    print(f"ERROR: {msg}", file=sys.stderr)
-    sys.exit(code)
+class LLMError(Exception):
+    """A provider call failed; main() reports it and exits."""
 
-def safe_json(resp: requests.Response) -> Any:
+def die(msg: str, code: int = 1) -> None:
+    # Terminal: skip interpreter teardown, but flush stdout so piped progress isn't lost.
+    sys.stdout.flush()
+    sys.stderr.buffer.write(b"ERROR: " + msg.encode("utf-8", "replace") + b"\n")
+    sys.stderr.flush()
+    os._exit(code)
+
+def encode_json(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+def decode_json(resp: requests.Response) -> Any:
+    # Both orjson's and requests' decode errors are ValueErrors; report them
+    # as provider failures whichever decoder is in use.
     try:
+        if orjson is not None:
+            return orjson.loads(resp.content)
         return resp.json()
-    except Exception:
-        return {"_non_json_body": resp.text[:4000]}
+    except ValueError:
+        raise LLMError(
+            f"{resp.request.method} {resp.url} -> {resp.status_code} non-JSON body\n{body_preview(resp, 2000)}"
+        ) from None
 
-def pretty(obj: Any) -> str:
-    return json.dumps(obj, indent=2, ensure_ascii=False)[:8000]
+def safe_json(resp: requests.Response) -> Any:
+    try:
+        return decode_json(resp)
+    except LLMError:
+        return {"_non_json_body": body_preview(resp, 4000)}
+
+def body_preview(resp: requests.Response, limit: int) -> str:
+    # Decode only the slice we show; resp.text decodes the whole body and may
+    # run charset detection when the server sends no charset.
+    return resp.content[:limit].decode("utf-8", "replace")
+
+def pretty(obj: Any, limit: int = 8000) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")[:limit]
+    # Stop encoding once the shown prefix is complete instead of dumping the whole reply.
+    out: List[str] = []
+    size = 0
+    for chunk in json.JSONEncoder(indent=2, ensure_ascii=False).iterencode(obj):
+        out.append(chunk)
+        size += len(chunk)
+        if size >= limit:
+            break
+    return "".join(out)[:limit]
+
+def cache_root() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "gitar")
+
+def models_cache_path(provider: str, base_url: str, api_key: Optional[str]) -> str:
+    # A different server or key may see a different catalog; only a hash of
+    # the key is written to disk.
+    digest = hashlib.sha256(f"{base_url}\0{api_key or ''}".encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_root(), f"models-{provider}-{digest}.json")
+
+def write_cache(path: str, obj: Any) -> None:
+    """Best-effort: write then rename so a concurrent run never reads half a file."""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(encode_json(obj))
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+def cached_list(provider: str, base_url: str, api_key: Optional[str], fetch: Callable[[], Any],
+                refresh: bool = False, max_age: int = MODELS_CACHE_MAX_AGE) -> Any:
+    """Return the model list for this provider, server and key from disk if fresh,
+    else fetch and store it."""
+    path = models_cache_path(provider, base_url, api_key)
+    if not refresh:
+        try:
+            if time.time() - os.stat(path).st_mtime < max_age:
+                with open(path, "rb") as f:
+                    return json.loads(f.read())
+        except (OSError, ValueError):
+            pass
+
+    models = fetch()
+    write_cache(path, models)
+    return models
+
+def cached_chat(provider: str, base_url: str, model: str, prompt: str, max_tokens: int,
+                fetch: Callable[[], Any], enabled: bool = False,
+                log: Callable[..., None] = print) -> Any:
+    """Return a stored chat reply for this exact request, else call the API and store it.
+
+    Every chat payload is sent with temperature 0, so the same request gives the same answer.
+    Opt-in (--cache): a hit makes no network call, so it says nothing about provider health.
+    """
+    if not enabled:
+        return fetch()
+    # Plain json so the key doesn't change with whether orjson is installed.
+    key = hashlib.sha256(json.dumps(
+        {"provider": provider, "base_url": base_url, "model": model,
+         "prompt": prompt, "max_tokens": max_tokens},
+        sort_keys=True,
+    ).encode("utf-8")).hexdigest()
+    path = os.path.join(cache_root(), "llm", f"{key}.json")
+    try:
+        with open(path, "rb") as f:
+            out = json.loads(f.read())
+        log("(cached reply)")
+        return out
+    except (OSError, ValueError):
+        pass
+
+    out = fetch()
+    write_cache(path, out)
+    return out
+
+def dig_text(obj: Any, *path: Any) -> Optional[str]:
+    """Follow a key/index path into decoded JSON; None if any step is missing or the leaf isn't a str."""
+    try:
+        for step in path:
+            obj = obj[step]
+    except (KeyError, IndexError, TypeError):
+        return None
+    return obj if isinstance(obj, str) else None
 
 def build_openai_compat_headers(api_key: Optional[str], extra: Optional[Dict[str, str]] = None) -> Dict[str, str]:
     h = {"Accept": "application/json", "Content-Type": "application/json"}
@@ -123,6 +310,31 @@ def build_openai_compat_headers(api_key: Optional[str], extra: Optional[Dict[str
                 h[k] = v
     return h
 
+@lru_cache(maxsize=None)
+def openai_compat_headers(provider: str, api_key: Optional[str]) -> Dict[str, str]:
+    """Headers for an OpenAI-compatible provider, built once and shared by every call."""
+    extra_env = PROVIDERS[provider].get("extra_headers") or {}
+    extra = {k: os.environ.get(env, default) for k, (env, default) in extra_env.items()}
+    return build_openai_compat_headers(api_key, extra)
+
+OPENAI_PREFER = ("gpt", "llama", "qwen", "deepseek", "mistral", "mixtral", "instruct", "sonar", "grok")
+CLAUDE_PREFER = ("sonnet", "opus", "haiku", "claude")
+GEMINI_PREFER = ("gemini-2", "gemini-1.5", "pro", "flash")
+
+@lru_cache(maxsize=None)
+def preference_pattern(prefer: Tuple[str, ...]) -> re.Pattern:
+    # Lookahead so overlapping preferences are all reported, not just the leftmost.
+    return re.compile("(?=(" + "|".join(map(re.escape, prefer)) + "))", re.IGNORECASE)
+
+def pick_preferred(ids: List[str], prefer: Tuple[str, ...]) -> str:
+    """First id matching the earliest preference; ids[0] when none match."""
+    rx = preference_pattern(prefer)
+    order = {p: i for i, p in enumerate(prefer)}
+    def rank(mid: str) -> int:
+        return min((order[m.group(1).lower()] for m in rx.finditer(mid)), default=len(prefer))
+    # min() keeps the first of equal ranks, so list order breaks ties.
+    return min(ids, key=rank)
+
 def pick_model_from_openai_models(models_json: Any) -> Optional[str]:
     data = models_json.get("data") if isinstance(models_json, dict) else None
     if not isinstance(data, list) or not data:
@@ -130,47 +342,38 @@ def pick_model_from_openai_models(models_json: Any) -> Optional[str]:
     ids = [m.get("id") for m in data if isinstance(m, dict) and isinstance(m.get("id"), str)]
     if not ids:
         return None
-    prefer = ["gpt", "llama", "qwen", "deepseek", "mistral", "mixtral", "instruct", "sonar", "grok"]
-    for p in prefer:
-        for mid in ids:
-            if p in mid.lower():
-                return mid
-    return ids[0]
+    return pick_preferred(ids, OPENAI_PREFER)
 
 def extract_openai_chat_text(chat_json: Any) -> Optional[str]:
     # {"choices":[{"message":{"content":"..."}}]}
-    if not isinstance(chat_json, dict):
-        return None
-    choices = chat_json.get("choices")
-    if not isinstance(choices, list) or not choices:
-        return None
-    msg = choices[0].get("message")
-    if isinstance(msg, dict) and isinstance(msg.get("content"), str):
-        return msg["content"]
-    return None
+    return dig_text(chat_json, "choices", 0, "message", "content")
+
+def post_chat(url: str, headers: Dict[str, str], body: bytes,
+              params: Optional[Dict[str, str]] = None) -> Any:
+    """POST an already-encoded JSON body; callers sending the same payload
+    repeatedly can encode it once and reuse the bytes."""
+    r = session().post(url, headers=headers, params=params, data=body, timeout=HTTP_TIMEOUT)
+    if r.status_code != 200:
+        raise LLMError(f"POST {url} -> {r.status_code}\n{body_preview(r, 4000)}")
+    return decode_json(r)
 
 # -----------------------------------------------------------------------------
 # OpenAI-compatible flow
 # -----------------------------------------------------------------------------
-def openai_compat_list_models(base_url: str, headers: Dict[str, str]) -> Any:
-    url = base_url.rstrip("/") + "/models"
-    r = requests.get(url, headers=headers, timeout=TIMEOUT)
+def openai_compat_list_models(url: str, headers: Dict[str, str]) -> Any:
+    r = session().get(url, headers=headers, timeout=LIST_TIMEOUT)
     if r.status_code != 200:
-        die(f"GET {url} -> {r.status_code}\n{r.text[:2000]}")
-    return r.json()
+        raise LLMError(f"GET {url} -> {r.status_code}\n{body_preview(r, 2000)}")
+    return decode_json(r)
 
-def openai_compat_chat(base_url: str, headers: Dict[str, str], model: str, prompt: str, max_tokens: int) -> Any:
-    url = base_url.rstrip("/") + "/chat/completions"
+def openai_compat_chat(url: str, headers: Dict[str, str], model: str, prompt: str, max_tokens: int) -> Any:
     payload = {
         "model": model,
         "messages": [{"role": "user", "content": prompt}],
         "temperature": 0,
         "max_tokens": max_tokens,
     }
-    r = requests.post(url, headers=headers, data=json.dumps(payload), timeout=TIMEOUT)
-    if r.status_code != 200:
-        die(f"POST {url} -> {r.status_code}\n{r.text[:4000]}")
-    return r.json()
+    return post_chat(url, headers, encode_json(payload))
 
 # -----------------------------------------------------------------------------
 # Anthropic (Claude) flow
@@ -183,12 +386,11 @@ def anthropic_headers(api_key: str, anthropic_version: str) -> Dict[str, str]:
         "anthropic-version": anthropic_version,
     }
 
-def anthropic_list_models(base_url: str, headers: Dict[str, str]) -> Any:
-    url = base_url.rstrip("/") + "/v1/models"
-    r = requests.get(url, headers=headers, timeout=TIMEOUT)
+def anthropic_list_models(url: str, headers: Dict[str, str]) -> Any:
+    r = session().get(url, headers=headers, timeout=LIST_TIMEOUT)
     if r.status_code != 200:
-        die(f"GET {url} -> {r.status_code}\n{r.text[:2000]}")
-    return r.json()
+        raise LLMError(f"GET {url} -> {r.status_code}\n{body_preview(r, 2000)}")
+    return decode_json(r)
 
 def anthropic_pick_model(models_json: Any) -> Optional[str]:
     # {"data":[{"id":"claude-..."},...]}
@@ -200,46 +402,31 @@ def anthropic_pick_model(models_json: Any) -> Optional[str]:
     ids = [m.get("id") for m in data if isinstance(m, dict) and isinstance(m.get("id"), str)]
     if not ids:
         return None
-    prefer = ["sonnet", "opus", "haiku", "claude"]
-    for p in prefer:
-        for mid in ids:
-            if p in mid.lower():
-                return mid
-    return ids[0]
-
-def anthropic_chat(base_url: str, headers: Dict[str, str], model: str, prompt: str, max_tokens: int) -> Any:
-    url = base_url.rstrip("/") + "/v1/messages"
+    return pick_preferred(ids, CLAUDE_PREFER)
+
+def anthropic_chat(url: str, headers: Dict[str, str], model: str, prompt: str, max_tokens: int) -> Any:
     payload = {
         "model": model,
         "max_tokens": max_tokens,
+        "temperature": 0,
         "messages": [{"role": "user", "content": prompt}],
     }
-    r = requests.post(url, headers=headers, data=json.dumps(payload), timeout=TIMEOUT)
-    if r.status_code != 200:
-        die(f"POST {url} -> {r.status_code}\n{r.text[:4000]}")
-    return r.json()
+    return post_chat(url, headers, encode_json(payload))
 
 def anthropic_extract_text(msg_json: Any) -> Optional[str]:
     # {"content":[{"type":"text","text":"..."}]}
-    if not isinstance(msg_json, dict):
-        return None
-    content = msg_json.get("content")
-    if not isinstance(content, list) or not content:
-        return None
-    first = content[0]
-    if isinstance(first, dict) and isinstance(first.get("text"), str):
-        return first["text"]
-    return None
+    return dig_text(msg_json, "content", 0, "text")
 
 # -----------------------------------------------------------------------------
 # Gemini (AI Studio) flow
 # -----------------------------------------------------------------------------
-def gemini_list_models(base_url: str, api_key: str) -> Any:
-    url = base_url.rstrip("/") + "/v1beta/models"
-    r = requests.get(url, params={"key": api_key}, timeout=TIMEOUT)
+GEMINI_HEADERS = {"Content-Type": "application/json"}
+
+def gemini_list_models(url: str, api_key: str) -> Any:
+    r = session().get(url, params={"key": api_key}, timeout=LIST_TIMEOUT)
     if r.status_code != 200:
-        die(f"GET {url} -> {r.status_code}\n{r.text[:2000]}")
-    return r.json()
+        raise LLMError(f"GET {url} -> {r.status_code}\n{body_preview(r, 2000)}")
+    return decode_json(r)
 
 def gemini_pick_model(models_json: Any) -> Optional[str]:
     # {"models":[{"name":"models/gemini-..."}]}
@@ -251,17 +438,12 @@ def gemini_pick_model(models_json: Any) -> Optional[str]:
     names = [m.get("name") for m in models if isinstance(m, dict) and isinstance(m.get("name"), str)]
     if not names:
         return None
-    prefer = ["gemini-2", "gemini-1.5", "pro", "flash"]
-    for p in prefer:
-        for n in names:
-            if p in n.lower():
-                return n
-    return names[0]
-
-def gemini_chat(base_url: str, api_key: str, model_name: str, prompt: str, max_tokens: int) -> Any:
+    return pick_preferred(names, GEMINI_PREFER)
+
+def gemini_chat(model_prefix: str, api_key: str, model_name: str, prompt: str, max_tokens: int) -> Any:
     # model_name typically like "models/gemini-1.5-flash"
     model_short = model_name.split("/", 1)[1] if model_name.startswith("models/") else model_name
-    url = base_url.rstrip("/") + f"/v1beta/models/{model_short}:generateContent"
+    url = f"{model_prefix}{model_short}:generateContent"
     payload = {
         "contents": [
             {"role": "user", "parts": [{"text": prompt}]}
@@ -272,162 +454,199 @@ def gemini_chat(base_url: str, api_key: str, model_name: str, prompt: str, max_t
             "temperature": 0,
         },
     }
-    r = requests.post(url, params={"key": api_key}, json=payload, timeout=TIMEOUT)
-    if r.status_code != 200:
-        die(f"POST {url} -> {r.status_code}\n{r.text[:4000]}")
-    return r.json()
+    return post_chat(url, GEMINI_HEADERS, encode_json(payload), params={"key": api_key})
 
 def gemini_extract_text(resp_json: Any) -> Optional[str]:
     # Often: {"candidates":[{"content":{"parts":[{"text":"..."}]}}]}
-    if not isinstance(resp_json, dict):
-        return None
-    cands = resp_json.get("candidates")
-    if not isinstance(cands, list) or not cands:
-        return None
-    content = cands[0].get("content")
-    if not isinstance(content, dict):
-        return None
-    parts = content.get("parts")
-    if not isinstance(parts, list) or not parts:
-        return None
-    if isinstance(parts[0], dict) and isinstance(parts[0].get("text"), str):
-        return parts[0]["text"]
-    return None
+    return dig_text(resp_json, "candidates", 0, "content", "parts", 0, "text")
 
 # -----------------------------------------------------------------------------
 # Main
 # -----------------------------------------------------------------------------
-def main() -> None:
-    ap = argparse.ArgumentParser(description="Unified LLM tester (OpenAI-compat + Claude + Gemini) using raw requests")
-    ap.add_argument("provider", choices=sorted(PROVIDERS.keys()))
-    ap.add_argument("--list", action="store_true", help="List all models and exit")
-    ap.add_argument("--model", help="Override model name/id")
-    ap.add_argument("--prompt", default="Reply with exactly: OK", help="Prompt to send")
-    ap.add_argument("--max-tokens", type=int, default=64, help="Max output tokens")
-    ap.add_argument("--raw", action="store_true", help="Print full JSON response (truncated)")
-    args = ap.parse_args()
-
-    cfg = PROVIDERS[args.provider]
+def report_reply(args: argparse.Namespace, out: Any, text: Optional[str], log: Callable[..., None]) -> None:
+    if args.raw:
+        log(pretty(out))
+    else:
+        log("Reply:", repr(text) if text is not None else "<no text parsed>")
+
+def probe_provider(name: str, args: argparse.Namespace, log: Callable[..., None] = print) -> None:
+    """List models and send one prompt to a provider. Raises LLMError on failure."""
+    cfg = PROVIDERS[name]
     ptype = cfg["type"]
 
-    print(f"==> Provider: {args.provider} ({ptype})")
+    log(f"==> Provider: {name} ({ptype})")
 
     # -----------------------------
     # OpenAI-compatible providers
     # -----------------------------
     if ptype == "openai_compat":
-        base = cfg["base_url"]
         key_env = cfg.get("api_key_env")
         api_key = os.environ.get(key_env) if key_env else None
         if key_env and not api_key:
-            die(f"Missing env var {key_env}")
-
-        headers = build_openai_compat_headers(api_key, cfg.get("extra_headers"))
-
-        models = openai_compat_list_models(base, headers)
-        data = models.get("data", []) if isinstance(models, dict) else []
-        print(f"Models found: {len(data)}")
-
-        if args.list:
-            for m in data:
-                mid = m.get("id")
-                if mid:
-                    print(mid)
-            return
-
-        model = args.model or pick_model_from_openai_models(models)
+            raise LLMError(f"Missing env var {key_env}")
+
+        headers = openai_compat_headers(name, api_key)
+
+        model = args.model
+        if args.list or not model:
+            models = cached_list(name, cfg["base_url"], api_key,
+                                 lambda: openai_compat_list_models(cfg["models_url"], headers),
+                                 args.refresh_models)
+            data = models.get("data", []) if isinstance(models, dict) else []
+            log(f"Models found: {len(data)}")
+
+            if args.list:
+                for m in data:
+                    mid = m.get("id")
+                    if mid:
+                        log(mid)
+                return
+
+            model = pick_model_from_openai_models(models)
         if not model:
-            die("Could not choose a model. Use --model")
-
-        print(f"Using model: {model}")
-        out = openai_compat_chat(base, headers, model, args.prompt, args.max_tokens)
-        text = extract_openai_chat_text(out)
-
-        if args.raw:
-            print(pretty(out))
-        else:
-            print("Reply:", repr(text) if text is not None else "<no text parsed>")
-
-        print("✅ SUCCESS")
+            raise LLMError("Could not choose a model. Use --model")
+
+        log(f"Using model: {model}")
+        out = cached_chat(name, cfg["base_url"], model, args.prompt, args.max_tokens,
+                          lambda: openai_compat_chat(cfg["chat_url"], headers, model, args.prompt, args.max_tokens),
+                          args.cache, log)
+        report_reply(args, out, extract_openai_chat_text(out), log)
+        log("✅ SUCCESS")
         return
 
     # -----------------------------
     # Claude (Anthropic)
     # -----------------------------
     if ptype == "anthropic":
-        base = cfg["base_url"]
         key_env = cfg["api_key_env"]
         api_key = os.environ.get(key_env)
         if not api_key:
-            die(f"Missing env var {key_env}")
+            raise LLMError(f"Missing env var {key_env}")
 
         headers = anthropic_headers(api_key, cfg.get("anthropic_version", "2023-06-01"))
 
-        models = anthropic_list_models(base, headers)
-        data = models.get("data", []) if isinstance(models, dict) else []
-        print(f"Models found: {len(data)}")
-
-        if args.list:
-            for m in data:
-                mid = m.get("id")
-                if mid:
-                    print(mid)
-            return
-
-        model = args.model or anthropic_pick_model(models)
+        model = args.model
+        if args.list or not model:
+            models = cached_list(name, cfg["base_url"], api_key,
+                                 lambda: anthropic_list_models(cfg["models_url"], headers),
+                                 args.refresh_models)
+            data = models.get("data", []) if isinstance(models, dict) else []
+            log(f"Models found: {len(data)}")
+
+            if args.list:
+                for m in data:
+                    mid = m.get("id")
+                    if mid:
+                        log(mid)
+                return
+
+            model = anthropic_pick_model(models)
         if not model:
-            die("Could not choose a model. Use --model")
-
-        print(f"Using model: {model}")
-        out = anthropic_chat(base, headers, model, args.prompt, args.max_tokens)
-        text = anthropic_extract_text(out)
-
-        if args.raw:
-            print(pretty(out))
-        else:
-            print("Reply:", repr(text) if text is not None else "<no text parsed>")
-
-        print("✅ SUCCESS")
+            raise LLMError("Could not choose a model. Use --model")
+
+        log(f"Using model: {model}")
+        out = cached_chat(name, cfg["base_url"], model, args.prompt, args.max_tokens,
+                          lambda: anthropic_chat(cfg["chat_url"], headers, model, args.prompt, args.max_tokens),
+                          args.cache, log)
+        report_reply(args, out, anthropic_extract_text(out), log)
+        log("✅ SUCCESS")
         return
 
     # -----------------------------
     # Gemini (Google AI Studio)
     # -----------------------------
     if ptype == "gemini":
-        base = cfg["base_url"]
         key_env = cfg["api_key_env"]
         api_key = os.environ.get(key_env)
         if not api_key:
-            die(f"Missing env var {key_env}")
-
-        models = gemini_list_models(base, api_key)
-        model_list = models.get("models", []) if isinstance(models, dict) else []
-        print(f"Models found: {len(model_list)}")
-
-        if args.list:
-            for m in model_list:
-                name = m.get("name")
-                if name:
-                    print(name)
-            return
-
-        model = args.model or gemini_pick_model(models)
+            raise LLMError(f"Missing env var {key_env}")
+
+        model = args.model
+        if args.list or not model:
+            models = cached_list(name, cfg["base_url"], api_key,
+                                 lambda: gemini_list_models(cfg["models_url"], api_key),
+                                 args.refresh_models)
+            model_list = models.get("models", []) if isinstance(models, dict) else []
+            log(f"Models found: {len(model_list)}")
+
+            if args.list:
+                for m in model_list:
+                    model_name = m.get("name")
+                    if model_name:
+                        log(model_name)
+                return
+
+            model = gemini_pick_model(models)
         if not model:
-            die("Could not choose a model. Use --model (e.g., models/gemini-1.5-flash)")
+            raise LLMError("Could not choose a model. Use --model (e.g., models/gemini-1.5-flash)")
+
+        log(f"Using model: {model}")
+        out = cached_chat(name, cfg["base_url"], model, args.prompt, args.max_tokens,
+                          lambda: gemini_chat(cfg["model_prefix"], api_key, model, args.prompt, args.max_tokens),
+                          args.cache, log)
+        report_reply(args, out, gemini_extract_text(out), log)
+        log("✅ SUCCESS")
+        return
 
-        print(f"Using model: {model}")
-        out = gemini_chat(base, api_key, model, args.prompt, args.max_tokens)
-        text = gemini_extract_text(out)
+    raise LLMError(f"Unknown provider type: {ptype}")
 
-        if args.raw:
-            print(pretty(out))
-        else:
-            print("Reply:", repr(text) if text is not None else "<no text parsed>")
+def probe_buffered(name: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """Run probe_provider capturing its output, for concurrent runs."""
+    lines: List[str] = []
+    log = lambda *parts: lines.append(" ".join(str(p) for p in parts))
+    try:
+        probe_provider(name, args, log)
+        return {"provider": name, "ok": True, "lines": lines}
+    except request_errors() as e:
+        lines.append(f"❌ FAILED: {e}")
+        return {"provider": name, "ok": False, "lines": lines}
+
+def provider_list(value: str) -> List[str]:
+    names = list(dict.fromkeys(n.strip() for n in value.split(",") if n.strip()))
+    unknown = [n for n in names if n not in PROVIDERS]
+    if unknown or not names:
+        raise argparse.ArgumentTypeError(
+            f"unknown provider(s): {', '.join(unknown) or value!r} (choose from {', '.join(sorted(PROVIDERS))})"
+        )
+    return names
 
-        print("✅ SUCCESS")
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Unified LLM tester (OpenAI-compat + Claude + Gemini) using raw requests")
+    ap.add_argument("provider", nargs="?", choices=sorted(PROVIDERS.keys()))
+    ap.add_argument("--all", action="store_true", help="Probe every provider concurrently")
+    ap.add_argument("--providers", type=provider_list, metavar="A,B,...",
+                    help="Probe these providers concurrently (comma-separated)")
+    ap.add_argument("--list", action="store_true", help="List all models and exit")
+    ap.add_argument("--refresh-models", action="store_true",
+                    help=f"Re-fetch model lists instead of using the cache (max age {MODELS_CACHE_MAX_AGE}s)")
+    ap.add_argument("--cache", action="store_true",
+                    help="Reuse a stored reply for an identical request (skips the live check)")
+    ap.add_argument("--model", help="Override model name/id")
+    ap.add_argument("--prompt", default="Reply with exactly: OK", help="Prompt to send")
+    ap.add_argument("--max-tokens", type=int, default=64, help="Max output tokens")
+    ap.add_argument("--raw", action="store_true", help="Print full JSON response (truncated)")
+    args = ap.parse_args()
+
+    if args.all or args.providers:
+        names = sorted(PROVIDERS.keys()) if args.all else args.providers
+        with ThreadPoolExecutor(max_workers=len(names)) as ex:
+            results = list(ex.map(lambda n: probe_buffered(n, args), names))
+        for res in results:
+            print("\n".join(res["lines"]))
+            print()
+        ok = sum(1 for res in results if res["ok"])
+        print(f"{ok}/{len(results)} providers OK")
+        if ok < len(results):
+            sys.exit(1)
         return
 
-    die(f"Unknown provider type: {ptype}")
+    if not args.provider:
+        ap.error("provider is required unless --all or --providers is given")
+
+    try:
+        probe_provider(args.provider, args)
+    except request_errors() as e:
+        die(str(e))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,87 @@
+// src/cache.rs
+use std::fs;
+use std::path::PathBuf;
+
+// =============================================================================
+// RESPONSE CACHE
+// =============================================================================
+// LLM responses stored on disk, one file per request, keyed by a hash of
+// everything that affects the reply (provider, model, settings, prompts).
+
+const FNV_OFFSET: u128 = 0x6c62272e07bb014262b821756295c58d;
+const FNV_PRIME: u128 = 0x0000000001000000000000000000013b;
+
+pub fn cache_dir() -> Option<PathBuf> {
+    dirs::cache_dir().map(|d| d.join("gitar").join("responses"))
+}
+
+/// Stable 128-bit FNV-1a key over length-prefixed parts.
+pub fn cache_key(parts: &[&str]) -> String {
+    let mut h = FNV_OFFSET;
+    let mut feed = |bytes: &[u8]| {
+        for b in bytes {
+            h ^= *b as u128;
+            h = h.wrapping_mul(FNV_PRIME);
+        }
+    };
+    for part in parts {
+        feed(&(part.len() as u64).to_le_bytes());
+        feed(part.as_bytes());
+    }
+    format!("{:032x}", h)
+}
+
+pub fn load(key: &str) -> Option<String> {
+    let path = cache_dir()?.join(format!("{}.txt", key));
+    fs::read_to_string(path).ok()
+}
+
+/// Best-effort write; a failed cache write never fails the command.
+pub fn store(key: &str, response: &str) {
+    let Some(dir) = cache_dir() else { return };
+    if fs::create_dir_all(&dir).is_err() {
+        return;
+    }
+    // Write then rename so concurrent readers never see a partial file.
+    let tmp = dir.join(format!("{}.{}.tmp", key, std::process::id()));
+    if fs::write(&tmp, response).is_ok() {
+        let _ = fs::rename(&tmp, dir.join(format!("{}.txt", key)));
+    }
+}
+
+// =============================================================================
+// MODULE TESTS
+// =============================================================================
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn cache_key_is_stable() {
+        assert_eq!(cache_key(&["a", "b"]), cache_key(&["a", "b"]));
+        assert_eq!(cache_key(&[]), format!("{:032x}", FNV_OFFSET));
+    }
+
+    #[test]
+    fn cache_key_is_hex_128() {
+        let key = cache_key(&["model", "system", "user"]);
+        assert_eq!(key.len(), 32);
+        assert!(key.chars().all(|c| c.is_ascii_hexdigit()));
+    }
+
+    #[test]
+    fn cache_key_differs_on_content() {
+        assert_ne!(cache_key(&["gpt-4o", "diff a"]), cache_key(&["gpt-4o", "diff b"]));
+        assert_ne!(cache_key(&["gpt-4o", "x"]), cache_key(&["gpt-4o-mini", "x"]));
+    }
+
+    #[test]
+    fn cache_key_respects_part_boundaries() {
+        assert_ne!(cache_key(&["ab", "c"]), cache_key(&["a", "bc"]));
+    }
+
+    #[test]
+    fn load_missing_key_returns_none() {
+        assert!(load("ffffffffffffffffffffffffffffffff-missing").is_none());
+    }
+}
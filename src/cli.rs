@@ -146,10 +146,23 @@ pub enum Commands {
         #[arg(short = 'n', long)]
         limit: Option<usize>,
 
-        /// Delay between API calls in milliseconds (useful to avoid rate limits)
+        /// Delay between starting API calls in milliseconds (useful to avoid rate limits)
         #[arg(long, default_value = "500")]
         delay: u64,
 
+        /// Maximum number of API calls in flight at once (1 = sequential)
+        #[arg(short = 'j', long, default_value = "8")]
+        concurrency: usize,
+
+        /// Always call the API instead of reusing cached replies for unchanged commits
+        #[arg(long)]
+        no_cache: bool,
+
+        /// Cheaper model to try first on small diffs; falls back to the
+        /// configured model when its reply isn't a valid Type(scope): message
+        #[arg(long, value_name = "MODEL")]
+        fast_model: Option<String>,
+
         /// Diff algorithm: 1=full, 2=files, 3=hunks, 4=semantic (default)
         #[arg(long, default_value = "4", value_parser = clap::value_parser!(u8).range(1..=4))]
         alg: u8,
@@ -565,6 +578,36 @@ mod tests {
         assert!(HOOK_SCRIPT.contains("command -v gitar"));
     }
 
+    #[test]
+    fn cli_parses_history_concurrency() {
+        let cli = Cli::try_parse_from(["gitar", "history", "-j", "2"]).unwrap();
+        if let Commands::History { concurrency, .. } = cli.command {
+            assert_eq!(concurrency, 2);
+        } else {
+            panic!("Expected History command");
+        }
+    }
+
+    #[test]
+    fn cli_parses_history_fast_model() {
+        let cli = Cli::try_parse_from(["gitar", "history", "--fast-model", "gpt-4o-mini"]).unwrap();
+        if let Commands::History { fast_model, .. } = cli.command {
+            assert_eq!(fast_model.as_deref(), Some("gpt-4o-mini"));
+        } else {
+            panic!("Expected History command");
+        }
+    }
+
+    #[test]
+    fn cli_parses_history_no_cache() {
+        let cli = Cli::try_parse_from(["gitar", "history", "--no-cache"]).unwrap();
+        if let Commands::History { no_cache, .. } = cli.command {
+            assert!(no_cache);
+        } else {
+            panic!("Expected History command");
+        }
+    }
+
     #[test]
     fn cli_parses_all_alg_values() {
         for alg_val in 1..=4 {
@@ -1,46 +1,70 @@
 // src/client.rs
 use anyhow::Result;
 use reqwest::{Client, Proxy};
+use std::sync::OnceLock;
+use std::time::Duration;
 
+use crate::cache;
 use crate::config::ResolvedConfig;
+use crate::diff::estimate_tokens;
 use crate::providers::{claude, gemini, openai};
+use crate::ratelimit::{RateLimited, RateLimiter};
+
+/// Retries after an HTTP 429 before giving up
+const MAX_RATE_LIMIT_RETRIES: u32 = 3;
 
 pub struct LlmClient {
-    http: Client,
+    /// Built on first request; TLS setup is skipped entirely when every
+    /// reply comes from the cache or the command fails before calling out.
+    http: OnceLock<Client>,
+    proxy: Option<Proxy>,
     provider: String,
     base_url: String,
     api_key: Option<String>,
     model: String,
     max_tokens: u32,
     temperature: f32,
+    limiter: Option<RateLimiter>,
 }
 
 impl LlmClient {
     pub fn new(config: &ResolvedConfig) -> Result<Self> {
-        let mut builder = Client::builder()
-            .danger_accept_invalid_certs(true)
-            .timeout(std::time::Duration::from_secs(120));
-
-        if let Ok(proxy_url) = std::env::var("ALL_PROXY") {
-            let proxy_url = proxy_url.trim();
-            if !proxy_url.is_empty() {
-                builder = builder.proxy(Proxy::all(proxy_url)?);
-            }
-        }
-
-        let http = builder.build()?;
+        // Parse the proxy now so a bad ALL_PROXY still fails up front.
+        let proxy = match std::env::var("ALL_PROXY") {
+            Ok(url) if !url.trim().is_empty() => Some(Proxy::all(url.trim())?),
+            _ => None,
+        };
 
         Ok(Self {
-            http,
+            http: OnceLock::new(),
+            proxy,
             provider: config.provider.clone(),
             base_url: config.base_url.trim_end_matches('/').to_string(),
             api_key: config.api_key.clone(),
             model: config.model.clone(),
             max_tokens: config.max_tokens,
             temperature: config.temperature,
+            limiter: RateLimiter::from_env(),
         })
     }
 
+    fn http(&self) -> Result<&Client> {
+        if let Some(http) = self.http.get() {
+            return Ok(http);
+        }
+
+        let mut builder = Client::builder()
+            .danger_accept_invalid_certs(true)
+            .timeout(Duration::from_secs(120));
+
+        if let Some(proxy) = &self.proxy {
+            builder = builder.proxy(proxy.clone());
+        }
+
+        let http = builder.build()?;
+        Ok(self.http.get_or_init(|| http))
+    }
+
     pub fn model(&self) -> &str {
         &self.model
     }
@@ -54,12 +78,88 @@ impl LlmClient {
     }
 
     pub async fn chat(&self, system: &str, user: &str, stream: bool) -> Result<String> {
+        self.chat_model(&self.model, system, user, stream).await
+    }
+
+    /// `chat` against `model` instead of the configured one.
+    pub async fn chat_model(
+        &self,
+        model: &str,
+        system: &str,
+        user: &str,
+        stream: bool,
+    ) -> Result<String> {
+        let mut attempt = 0;
+        loop {
+            // Only pay for the estimate when a limiter is configured.
+            if let Some(limiter) = &self.limiter {
+                let est_tokens =
+                    (estimate_tokens(system) + estimate_tokens(user)) as u32 + self.max_tokens;
+                limiter.acquire(est_tokens).await;
+            }
+
+            let result = self.send_chat(model, system, user, stream).await;
+            let wait = match &result {
+                Err(e) if attempt < MAX_RATE_LIMIT_RETRIES => e
+                    .downcast_ref::<RateLimited>()
+                    .map(|rl| rl.retry_after.unwrap_or(Duration::from_secs(5 << attempt))),
+                _ => None,
+            };
+
+            let Some(wait) = wait else { return result };
+            eprintln!("Rate limited, retrying in {:.1}s...", wait.as_secs_f32());
+            tokio::time::sleep(wait).await;
+            attempt += 1;
+        }
+    }
+
+    /// Like `chat_model`, but replies are reused from the on-disk cache when the
+    /// exact same request (provider, model, settings, prompts) was seen before.
+    pub async fn chat_cached(
+        &self,
+        model: &str,
+        system: &str,
+        user: &str,
+        stream: bool,
+    ) -> Result<String> {
+        let max_tokens = self.max_tokens.to_string();
+        let temperature = self.temperature.to_string();
+        let key = cache::cache_key(&[
+            &self.provider,
+            &self.base_url,
+            model,
+            &max_tokens,
+            &temperature,
+            system,
+            user,
+        ]);
+
+        if let Some(hit) = cache::load(&key) {
+            if stream {
+                println!("{}", hit);
+            }
+            return Ok(hit);
+        }
+
+        let reply = self.chat_model(model, system, user, stream).await?;
+        cache::store(&key, &reply);
+        Ok(reply)
+    }
+
+    async fn send_chat(
+        &self,
+        model: &str,
+        system: &str,
+        user: &str,
+        stream: bool,
+    ) -> Result<String> {
+        let http = self.http()?;
         if self.is_claude_api() {
             return claude::chat(
-                &self.http,
+                http,
                 &self.base_url,
                 self.api_key.as_deref(),
-                &self.model,
+                model,
                 self.max_tokens,
                 self.temperature,
                 system,
@@ -71,10 +171,10 @@ impl LlmClient {
 
         if self.is_gemini_api() {
             return gemini::chat(
-                &self.http,
+                http,
                 &self.base_url,
                 self.api_key.as_deref(),
-                &self.model,
+                model,
                 self.max_tokens,
                 self.temperature,
                 system,
@@ -85,10 +185,10 @@ impl LlmClient {
         }
 
         openai::chat(
-            &self.http,
+            http,
             &self.base_url,
             self.api_key.as_deref(),
-            &self.model,
+            model,
             self.max_tokens,
             self.temperature,
             system,
@@ -99,15 +199,16 @@ impl LlmClient {
     }
 
     pub async fn list_models(&self) -> Result<Vec<String>> {
+        let http = self.http()?;
         if self.is_gemini_api() {
-            return gemini::list_models(&self.http, &self.base_url, self.api_key.as_deref()).await;
+            return gemini::list_models(http, &self.base_url, self.api_key.as_deref()).await;
         }
 
         if self.is_claude_api() {
-            return claude::list_models(&self.http, &self.base_url, self.api_key.as_deref()).await;
+            return claude::list_models(http, &self.base_url, self.api_key.as_deref()).await;
         }
 
-        openai::list_models(&self.http, &self.base_url, self.api_key.as_deref()).await
+        openai::list_models(http, &self.base_url, self.api_key.as_deref()).await
     }
 }
 
@@ -159,6 +260,7 @@ mod tests {
             base_url: base_url.into(),
             base_branch: "main".into(),
             stream: false,
+            stream_explicit: false,
             max_diff_chars: 10_000,
         }
     }
@@ -278,11 +380,15 @@ mod tests {
             base_url: "https://api.openai.com/v1/".into(),
             base_branch: "main".into(),
             stream: false,
+            stream_explicit: false,
             max_diff_chars: 10_000,
         };
         let client = LlmClient::new(&config).unwrap();
         assert!(!client.base_url.ends_with('/'));
         assert_eq!(client.base_url, "https://api.openai.com/v1");
+        assert!(client.http.get().is_none());
+        assert!(client.http().is_ok());
+        assert!(client.http.get().is_some());
     }
 
     #[test]
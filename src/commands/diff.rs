@@ -13,10 +13,17 @@ pub fn cmd_diff(
     stats_only: bool,
     compare: bool,
 ) -> Result<()> {
+    // The raw preview only shows the first max_chars, so don't read past them.
+    let read_limit = if alg.is_some() || compare {
+        usize::MAX
+    } else {
+        max_chars
+    };
+
     let raw_diff = if staged {
-        get_diff(None, true, usize::MAX)?
+        get_diff(None, true, read_limit)?
     } else {
-        get_diff(target.as_deref(), false, usize::MAX)?
+        get_diff(target.as_deref(), false, read_limit)?
     };
 
     if raw_diff.trim().is_empty() {
@@ -73,15 +80,8 @@ pub fn cmd_diff(
         }
 
         if !stats_only {
-            let truncated = if raw_diff.len() > max_chars {
-                &raw_diff[..max_chars]
-            } else {
-                &raw_diff
-            };
-            println!("{}", truncated);
-            if raw_diff.len() > max_chars {
-                println!("\n[... truncated at {} chars ...]", max_chars);
-            }
+            // Already cut to max_chars (with a truncation marker) by get_diff
+            println!("{}", raw_diff);
         }
     }
 
@@ -2,7 +2,7 @@
 use anyhow::Result;
 
 use crate::client::LlmClient;
-use crate::git::{build_diff_target, get_commit_logs, get_diff, get_diff_stats};
+use crate::git::{build_diff_target, get_commit_logs, get_diff_and_stats, has_changes};
 use crate::prompt::{EXPLAIN_SYSTEM_PROMPT, EXPLAIN_USER_PROMPT};
 
 use super::apply_smart_diff;
@@ -33,9 +33,13 @@ pub async fn cmd_explain(
 
     let (diff, stats) = if staged {
         println!("Explaining staged changes...\n");
-        let raw_diff = get_diff(None, true, usize::MAX)?;
+        if !has_changes(None, true) {
+            println!("No changes detected.");
+            return Ok(());
+        }
+        let (raw_diff, stats) = get_diff_and_stats(None, true, usize::MAX)?;
         let diff = apply_smart_diff(&raw_diff, max_diff_chars, false, alg)?;
-        (diff, get_diff_stats(None, true)?)
+        (diff, stats)
     } else {
         let effective_from = match (&from, &since, &until) {
             (Some(_), _, _) => from.clone(),
@@ -59,9 +63,14 @@ pub async fn cmd_explain(
             Some(diff_target.as_str())
         };
 
-        let raw_diff = get_diff(diff_target_ref, false, usize::MAX)?;
+        if !has_changes(diff_target_ref, false) {
+            println!("No changes detected.");
+            return Ok(());
+        }
+
+        let (raw_diff, stats) = get_diff_and_stats(diff_target_ref, false, usize::MAX)?;
         let diff = apply_smart_diff(&raw_diff, max_diff_chars, false, alg)?;
-        (diff, get_diff_stats(diff_target_ref, false)?)
+        (diff, stats)
     };
 
     if diff.trim().is_empty() {
@@ -1,12 +1,16 @@
 // src/commands/history.rs
 use anyhow::Result;
+use futures_util::stream::{self, StreamExt};
 
 use crate::client::LlmClient;
-use crate::git::{get_commit_diff, get_commit_logs};
+use crate::git::{get_commit_diffs, get_commit_logs};
 use crate::prompt::{HISTORY_SYSTEM_PROMPT, HISTORY_USER_PROMPT};
 
 use super::apply_smart_diff;
 
+/// Diffs shorter than this go to `--fast-model` first
+const FAST_MODEL_MAX_DIFF_CHARS: usize = 2000;
+
 pub async fn cmd_history(
     client: &LlmClient,
     from: Option<String>,
@@ -15,6 +19,9 @@ pub async fn cmd_history(
     until: Option<String>,
     limit: Option<usize>,
     delay: u64,
+    concurrency: usize,
+    use_cache: bool,
+    fast_model: Option<String>,
     stream: bool,
     alg: u8,
     max_diff_chars: usize,
@@ -45,6 +52,15 @@ pub async fn cmd_history(
 
     println!("Processing {} commits...\n", commits.len());
 
+    // Collect all diffs up front in one git call so the API calls can fan out.
+    let hashes: Vec<&str> = commits.iter().map(|c| c.hash.as_str()).collect();
+    let diffs = get_commit_diffs(&hashes, usize::MAX)?;
+
+    // A streamed fast reply would already be on screen before it could be
+    // rejected, so escalation only applies to buffered replies.
+    let fast_model = if stream { None } else { fast_model.as_deref() };
+
+    let mut jobs: Vec<(String, Option<String>, bool)> = Vec::with_capacity(commits.len());
     for (i, c) in commits.iter().enumerate() {
         let h = &c.hash[..8.min(c.hash.len())];
         let d = &c.date[..10.min(c.date.len())];
@@ -59,7 +75,7 @@ pub async fn cmd_history(
             &c.message
         };
 
-        println!(
+        let header = format!(
             "[{}/{}] {} | {} | {:15} | {}",
             i + 1,
             commits.len(),
@@ -69,39 +85,155 @@ pub async fn cmd_history(
             m
         );
 
-        let raw_diff = match get_commit_diff(&c.hash, usize::MAX)? {
-            Some(d) if !d.trim().is_empty() => d,
-            _ => {
-                println!("  - No diff");
-                continue;
+        let (prompt, small) = match diffs.get(&c.hash) {
+            Some(raw_diff) => {
+                let diff = apply_smart_diff(raw_diff, max_diff_chars, true, alg)?;
+                (
+                    Some(
+                        HISTORY_USER_PROMPT
+                            .replace("{original_message}", &c.message)
+                            .replace("{diff}", &diff),
+                    ),
+                    raw_diff.len() < FAST_MODEL_MAX_DIFF_CHARS,
+                )
             }
+            None => (None, false),
         };
 
-        let diff = apply_smart_diff(&raw_diff, max_diff_chars, true, alg)?;
-
-        let prompt = HISTORY_USER_PROMPT
-            .replace("{original_message}", &c.message)
-            .replace("{diff}", &diff);
-
-        match client.chat(HISTORY_SYSTEM_PROMPT, &prompt, stream).await {
-            Ok(r) => {
-                if stream {
-                    println!();
-                } else {
-                    for (j, l) in r.lines().enumerate() {
-                        if !l.trim().is_empty() {
-                            println!("{}{}", if j == 0 { "  - " } else { "    " }, l);
-                        }
-                    }
-                }
+        jobs.push((header, prompt, small));
+    }
+
+    // Streamed replies print as they arrive, so they can't be interleaved.
+    if stream || concurrency <= 1 {
+        for (i, (header, prompt, small)) in jobs.iter().enumerate() {
+            println!("{}", header);
+
+            let Some(prompt) = prompt else {
+                println!("  - No diff");
+                continue;
+            };
+
+            let fast = fast_model.filter(|_| *small);
+            print_reply(ask(client, fast, prompt, stream, use_cache).await, stream);
+
+            if i < jobs.len() - 1 {
+                tokio::time::sleep(tokio::time::Duration::from_millis(delay)).await;
             }
-            Err(e) => println!("  x {}", e),
         }
+        return Ok(());
+    }
 
-        if i < commits.len() - 1 {
-            tokio::time::sleep(tokio::time::Duration::from_millis(delay)).await;
+    // Requests start `delay` ms apart with at most `concurrency` in flight;
+    // `buffered` yields results in commit order.
+    let start = tokio::time::Instant::now();
+    let mut replies = stream::iter(jobs.iter().enumerate().map(|(i, (_, prompt, small))| async move {
+        let prompt = prompt.as_deref()?;
+        let fast = fast_model.filter(|_| *small);
+        tokio::time::sleep_until(start + tokio::time::Duration::from_millis(delay * i as u64)).await;
+        Some(ask(client, fast, prompt, false, use_cache).await)
+    }))
+    .buffered(concurrency);
+
+    let mut headers = jobs.iter().map(|(header, _, _)| header);
+    while let Some(reply) = replies.next().await {
+        if let Some(header) = headers.next() {
+            println!("{}", header);
+        }
+        match reply {
+            Some(r) => print_reply(r, false),
+            None => println!("  - No diff"),
         }
     }
 
     Ok(())
-}
\ No newline at end of file
+}
+
+// Try the fast model first when given; escalate to the configured model if
+// it fails or its reply doesn't follow the Type(scope): format.
+async fn ask(
+    client: &LlmClient,
+    fast_model: Option<&str>,
+    prompt: &str,
+    stream: bool,
+    use_cache: bool,
+) -> Result<String> {
+    if let Some(fast) = fast_model {
+        if let Ok(r) = ask_model(client, fast, prompt, stream, use_cache).await {
+            if is_commit_message(&r) {
+                return Ok(r);
+            }
+        }
+    }
+    ask_model(client, client.model(), prompt, stream, use_cache).await
+}
+
+// Commits are immutable, so a reply for the same diff can be reused across runs.
+async fn ask_model(
+    client: &LlmClient,
+    model: &str,
+    prompt: &str,
+    stream: bool,
+    use_cache: bool,
+) -> Result<String> {
+    if use_cache {
+        client.chat_cached(model, HISTORY_SYSTEM_PROMPT, prompt, stream).await
+    } else {
+        client.chat_model(model, HISTORY_SYSTEM_PROMPT, prompt, stream).await
+    }
+}
+
+/// `Type(scope):` on the first line followed by at least one description line.
+fn is_commit_message(reply: &str) -> bool {
+    let mut lines = reply.lines().map(str::trim).filter(|l| !l.is_empty());
+    let Some(first) = lines.next() else { return false };
+    let Some((kind, rest)) = first.split_once('(') else { return false };
+    let Some(scope) = rest.strip_suffix("):") else { return false };
+
+    let mut chars = kind.chars();
+    chars.next().is_some_and(|c| c.is_ascii_uppercase())
+        && chars.all(|c| c.is_ascii_lowercase())
+        && !scope.is_empty()
+        && !scope.contains(')')
+        && lines.next().is_some()
+}
+
+fn print_reply(reply: Result<String>, stream: bool) {
+    match reply {
+        Ok(r) => {
+            if stream {
+                println!();
+            } else {
+                for (j, l) in r.lines().enumerate() {
+                    if !l.trim().is_empty() {
+                        println!("{}{}", if j == 0 { "  - " } else { "    " }, l);
+                    }
+                }
+            }
+        }
+        Err(e) => println!("  x {}", e),
+    }
+}
+
+// =============================================================================
+// MODULE TESTS
+// =============================================================================
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn is_commit_message_accepts_expected_format() {
+        assert!(is_commit_message("Fix(parser):\nHandle empty input"));
+        assert!(is_commit_message("\nFeat(cli): \n  Add --fast-model flag\n"));
+    }
+
+    #[test]
+    fn is_commit_message_rejects_malformed_replies() {
+        assert!(!is_commit_message(""));
+        assert!(!is_commit_message("Fix(parser):"));
+        assert!(!is_commit_message("fix(parser):\nHandle empty input"));
+        assert!(!is_commit_message("Fix parser bug\nHandle empty input"));
+        assert!(!is_commit_message("Fix():\nHandle empty input"));
+        assert!(!is_commit_message("Fix(parser): handle empty input\nMore"));
+    }
+}
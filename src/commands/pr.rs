@@ -2,7 +2,7 @@
 use anyhow::Result;
 
 use crate::client::LlmClient;
-use crate::git::{build_diff_target, build_range, get_commit_logs, get_current_branch, get_diff, get_diff_stats};
+use crate::git::{build_diff_target, build_range, get_commit_logs, get_current_branch, get_diff_and_stats, has_changes};
 use crate::prompt::{PR_SYSTEM_PROMPT, PR_USER_PROMPT};
 
 use super::apply_smart_diff;
@@ -23,11 +23,26 @@ pub async fn cmd_pr(
     println!("PR: {} -> {}\n", branch, target_base);
 
     let (diff, stats, commits_text) = if staged {
-        let raw_diff = get_diff(None, true, usize::MAX)?;
+        if !has_changes(None, true) {
+            println!("No changes detected.");
+            return Ok(());
+        }
+        let (raw_diff, stats) = get_diff_and_stats(None, true, usize::MAX)?;
         let diff = apply_smart_diff(&raw_diff, max_diff_chars, false, alg)?;
-        (diff, get_diff_stats(None, true)?, "(staged changes)".into())
+        (diff, stats, "(staged changes)".into())
     } else {
         let diff_target = build_diff_target(base.as_deref(), to.as_deref(), base_branch);
+        let diff_target_ref = if diff_target.is_empty() {
+            None
+        } else {
+            Some(diff_target.as_str())
+        };
+
+        if !has_changes(diff_target_ref, false) {
+            println!("No changes detected.");
+            return Ok(());
+        }
+
         let range = build_range(base.as_deref(), to.as_deref(), base_branch);
 
         let commits = get_commit_logs(Some(20), None, None, range.as_deref())?;
@@ -37,18 +52,12 @@ pub async fn cmd_pr(
             .collect::<Vec<_>>()
             .join("\n");
 
-        let diff_target_ref = if diff_target.is_empty() {
-            None
-        } else {
-            Some(diff_target.as_str())
-        };
-
-        let raw_diff = get_diff(diff_target_ref, false, usize::MAX)?;
+        let (raw_diff, stats) = get_diff_and_stats(diff_target_ref, false, usize::MAX)?;
         let diff = apply_smart_diff(&raw_diff, max_diff_chars, false, alg)?;
 
         (
             diff,
-            get_diff_stats(diff_target_ref, false)?,
+            stats,
             if ct.is_empty() {
                 "(no commits)".into()
             } else {
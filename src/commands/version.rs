@@ -2,7 +2,7 @@
 use anyhow::Result;
 
 use crate::client::LlmClient;
-use crate::git::{build_diff_target, get_current_version, get_diff};
+use crate::git::{build_diff_target, get_current_version, get_diff, has_changes};
 use crate::prompt::{VERSION_SYSTEM_PROMPT, VERSION_USER_PROMPT};
 
 use super::apply_smart_diff;
@@ -27,6 +27,11 @@ pub async fn cmd_version(
         Some(diff_target.as_str())
     };
 
+    if !has_changes(diff_target_ref, false) {
+        println!("No changes detected.");
+        return Ok(());
+    }
+
     let raw_diff = get_diff(diff_target_ref, false, usize::MAX)?;
 
     if raw_diff.trim().is_empty() {
@@ -144,6 +144,8 @@ pub struct ResolvedConfig {
     pub base_url: String,
     pub base_branch: String,
     pub stream: bool,
+    /// `stream` came from the CLI or config rather than the default.
+    pub stream_explicit: bool,
     pub max_diff_chars: usize,
 }
 
@@ -208,9 +210,8 @@ impl ResolvedConfig {
             .unwrap_or_else(default_branch_fn);
 
         // Stream: CLI > provider config > default (false)
-        let stream = cli_stream
-            .or_else(|| provider_config.and_then(|p| p.stream))
-            .unwrap_or(false);
+        let stream_setting = cli_stream.or_else(|| provider_config.and_then(|p| p.stream));
+        let stream = stream_setting.unwrap_or(false);
 
         // Max diff chars: config > default
         let max_diff_chars = file.max_diff_chars.unwrap_or(DEFAULT_MAX_DIFF_CHARS);
@@ -224,9 +225,21 @@ impl ResolvedConfig {
             base_url,
             base_branch,
             stream,
+            stream_explicit: stream_setting.is_some(),
             max_diff_chars,
         }
     }
+
+    /// Streaming for single-reply commands (pr, changelog, explain, version).
+    /// An explicit setting wins; otherwise stream when stdout is a terminal,
+    /// so output appears at first token instead of after the whole reply.
+    pub fn stream_interactive(&self, is_terminal: bool) -> bool {
+        if self.stream_explicit {
+            self.stream
+        } else {
+            is_terminal
+        }
+    }
 }
 
 // =============================================================================
@@ -439,6 +452,34 @@ mod tests {
         assert!(!resolved.stream);
     }
 
+    #[test]
+    fn resolved_config_interactive_stream_follows_terminal_by_default() {
+        let file = Config::default();
+        let resolved = ResolvedConfig::new(
+            None, None, None, None, None, None, None, None,
+            &file, || "main".into(),
+        );
+        assert!(resolved.stream_interactive(true));
+        assert!(!resolved.stream_interactive(false));
+    }
+
+    #[test]
+    fn resolved_config_interactive_stream_respects_config() {
+        let file = Config {
+            openai: Some(ProviderConfig {
+                stream: Some(false),
+                ..Default::default()
+            }),
+            ..Default::default()
+        };
+        let provider = "openai".to_string();
+        let resolved = ResolvedConfig::new(
+            None, None, None, None, None, Some(&provider), None, None,
+            &file, || "main".into(),
+        );
+        assert!(!resolved.stream_interactive(true));
+    }
+
     #[test]
     fn resolved_config_uses_stream_from_provider_config() {
         let file = Config {
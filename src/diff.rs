@@ -8,8 +8,38 @@
 
 use std::collections::HashMap;
 
-/// Estimated tokens ≈ chars / 3.5 for code (conservative)
-const CHARS_PER_TOKEN: f32 = 3.5;
+/// Estimate BPE token count without a tokenizer, for reported stats.
+///
+/// Letter/digit runs cost one token per 5 chars, punctuation runs one per
+/// 2 chars, line breaks one each; other whitespace merges into neighbours.
+/// Lands near 3 chars/token on code diffs, where a flat chars/3.5 undercounts.
+/// It is not used to size diffs: without a real vocabulary it rates prose and
+/// code too alike to budget them differently.
+pub fn estimate_tokens(text: &str) -> usize {
+    let mut tokens = 0;
+    let mut word = 0usize;
+    let mut punct = 0usize;
+    for c in text.chars() {
+        if c.is_alphanumeric() || c == '_' {
+            tokens += punct.div_ceil(2);
+            punct = 0;
+            word += 1;
+            continue;
+        }
+        tokens += word.div_ceil(5);
+        word = 0;
+        if c.is_whitespace() {
+            tokens += punct.div_ceil(2);
+            punct = 0;
+            if c == '\n' {
+                tokens += 1;
+            }
+        } else {
+            punct += 1;
+        }
+    }
+    tokens + word.div_ceil(5) + punct.div_ceil(2)
+}
 
 /// File priority scores (higher = more important)
 const PRIORITY_SCORES: &[(&str, i32)] = &[
@@ -265,7 +295,7 @@ fn alg_full(raw_diff: &str, diff_stats: Option<&str>, max_chars: usize) -> (Stri
         excluded_files: 0,
         total_chars,
         output_chars: output.len(),
-        estimated_tokens: (output.len() as f32 / CHARS_PER_TOKEN) as usize,
+        estimated_tokens: estimate_tokens(&output),
         truncated,
         algorithm: DiffAlg::Full,
     };
@@ -339,7 +369,7 @@ fn alg_files(raw_diff: &str, diff_stats: Option<&str>, max_chars: usize) -> (Str
         excluded_files: total_files.saturating_sub(included),
         total_chars,
         output_chars: output.len(),
-        estimated_tokens: (output.len() as f32 / CHARS_PER_TOKEN) as usize,
+        estimated_tokens: estimate_tokens(&output),
         truncated,
         algorithm: DiffAlg::Files,
     };
@@ -420,7 +450,7 @@ fn alg_hunks(raw_diff: &str, diff_stats: Option<&str>, max_chars: usize) -> (Str
         excluded_files: total_files.saturating_sub(included_files.len()),
         total_chars,
         output_chars: output.len(),
-        estimated_tokens: (output.len() as f32 / CHARS_PER_TOKEN) as usize,
+        estimated_tokens: estimate_tokens(&output),
         truncated,
         algorithm: DiffAlg::Hunks,
     };
@@ -784,7 +814,7 @@ fn alg_semantic(raw_diff: &str, diff_stats: Option<&str>, max_chars: usize) -> (
         excluded_files: total_files.saturating_sub(files.len()),
         total_chars,
         output_chars: json.len(),
-        estimated_tokens: (json.len() as f32 / CHARS_PER_TOKEN) as usize,
+        estimated_tokens: estimate_tokens(&json),
         truncated,
         algorithm: DiffAlg::Semantic,
     };
@@ -889,6 +919,24 @@ index ccccccc..ddddddd 100644
         assert_eq!(stats.algorithm, DiffAlg::Semantic);
     }
 
+    #[test]
+    fn test_estimate_tokens() {
+        assert_eq!(estimate_tokens(""), 0);
+        assert_eq!(estimate_tokens("hello world"), 2);
+        assert_eq!(estimate_tokens("a + b;\n"), 5);
+        // Code diffs estimate denser than the flat chars/3.5 ratio.
+        let est = estimate_tokens(SAMPLE_DIFF);
+        assert!(est > (SAMPLE_DIFF.len() as f32 / 3.5) as usize);
+    }
+
+    #[test]
+    fn test_preview_reports_estimated_tokens() {
+        let diff = SAMPLE_DIFF.repeat(20);
+        let (output, stats) = get_llm_diff_preview(&diff, None, 2000, DiffAlg::Full, false);
+        assert!(stats.truncated);
+        assert_eq!(stats.estimated_tokens, estimate_tokens(&output));
+    }
+
     #[test]
     fn test_alg_names() {
         assert_eq!(DiffAlg::Full.name(), "Full Diff");
@@ -1,7 +1,10 @@
 // src/git.rs
 use anyhow::Result;
+use std::collections::HashMap;
+use std::io::{Read, Write};
 use std::path::PathBuf;
-use std::process::Command;
+use std::process::{Command, Stdio};
+use std::sync::OnceLock;
 
 // =============================================================================
 // EXCLUDE PATTERNS
@@ -20,6 +23,17 @@ pub const EXCLUDE_PATTERNS: &[&str] = &[
     ":(exclude)target/*",
 ];
 
+/// Line prefix marking the start of each commit in bulk `git log -p` output
+const COMMIT_MARKER: &str = "__COMMIT__";
+
+/// ASCII unit/record separators for `git log --pretty`; unlike `|` they
+/// never appear in author names or subjects.
+const FIELD_SEP: char = '\x1f';
+const RECORD_SEP: char = '\x1e';
+
+/// Start of each file section in a unified diff
+const FILE_MARKER: &str = "\ndiff --git";
+
 // =============================================================================
 // COMMIT INFO
 // =============================================================================
@@ -34,35 +48,137 @@ pub struct CommitInfo {
 // =============================================================================
 // GIT UTILITIES
 // =============================================================================
+/// A `git` command set up for read-mostly scripted use: no pager, and no
+/// optional index lock, so `diff`/`status` never block or rewrite the index
+/// behind a concurrent git process.
+fn git_command() -> Command {
+    let mut cmd = Command::new("git");
+    cmd.arg("--no-pager").env("GIT_OPTIONAL_LOCKS", "0");
+    cmd
+}
+
+/// Take ownership of git output as a String without copying it when it is
+/// valid UTF-8 (the common case); only invalid output pays for a lossy copy.
+pub fn decode_output(bytes: Vec<u8>) -> String {
+    String::from_utf8(bytes)
+        .unwrap_or_else(|e| String::from_utf8_lossy(e.as_bytes()).into_owned())
+}
+
 pub fn run_git(args: &[&str]) -> Result<String> {
-    let output = Command::new("git")
+    let output = git_command()
         .args(args)
         .output()
         .map_err(|e| anyhow::anyhow!("Failed to execute git: {}", e))?;
-    Ok(String::from_utf8_lossy(&output.stdout).to_string())
+    Ok(decode_output(output.stdout))
+}
+
+/// Output of `run_git_bounded`.
+#[derive(Debug)]
+pub struct BoundedOutput {
+    pub text: String,
+    /// Stdout was longer than the cap and git was stopped early.
+    pub exceeded: bool,
+    /// Offset of the last `\ndiff --git` lying entirely within the cap;
+    /// only looked up when `exceeded`.
+    pub last_file_start: Option<usize>,
+}
+
+/// Run git reading at most `max_bytes` of stdout (plus the rest of the
+/// chunk that crossed it), then stop git early.
+///
+/// Uncapped reads never scan the output; a capped read that overflows
+/// searches backwards from the cap once for the last file boundary.
+pub fn run_git_bounded(args: &[&str], max_bytes: usize) -> Result<BoundedOutput> {
+    let mut child = git_command()
+        .args(args)
+        .stdout(Stdio::piped())
+        .stderr(Stdio::null())
+        .spawn()
+        .map_err(|e| anyhow::anyhow!("Failed to execute git: {}", e))?;
+
+    let mut buf = Vec::new();
+    let mut exceeded = false;
+    if let Some(mut stdout) = child.stdout.take() {
+        let mut chunk = vec![0u8; 64 * 1024];
+        loop {
+            let n = stdout.read(&mut chunk)?;
+            if n == 0 {
+                break;
+            }
+            buf.extend_from_slice(&chunk[..n]);
+            if buf.len() > max_bytes {
+                exceeded = true;
+                break;
+            }
+        }
+    }
+
+    if exceeded {
+        let _ = child.kill();
+    }
+    let _ = child.wait();
+
+    let text = decode_output(buf);
+    // Searching the decoded text keeps offsets valid even after lossy decoding.
+    let last_file_start = if exceeded {
+        text[..floor_char_boundary(&text, max_bytes)].rfind(FILE_MARKER)
+    } else {
+        None
+    };
+    Ok(BoundedOutput {
+        text,
+        exceeded,
+        last_file_start,
+    })
+}
+
+/// Run git with `input` written to its stdin (for `--stdin` style commands).
+pub fn run_git_with_input(args: &[&str], input: &str) -> Result<String> {
+    let mut child = git_command()
+        .args(args)
+        .stdin(Stdio::piped())
+        .stdout(Stdio::piped())
+        .stderr(Stdio::piped())
+        .spawn()
+        .map_err(|e| anyhow::anyhow!("Failed to execute git: {}", e))?;
+
+    // git reads all of stdin before it starts writing, so this can't deadlock.
+    if let Some(mut stdin) = child.stdin.take() {
+        stdin.write_all(input.as_bytes())?;
+    }
+
+    let output = child
+        .wait_with_output()
+        .map_err(|e| anyhow::anyhow!("Failed to execute git: {}", e))?;
+    Ok(decode_output(output.stdout))
 }
 
 pub fn run_git_status(args: &[&str]) -> (String, String, bool) {
-    match Command::new("git").args(args).output() {
+    match git_command().args(args).output() {
         Ok(o) => (
-            String::from_utf8_lossy(&o.stdout).to_string(),
-            String::from_utf8_lossy(&o.stderr).to_string(),
+            decode_output(o.stdout),
+            decode_output(o.stderr),
             o.status.success(),
         ),
         Err(e) => (String::new(), e.to_string(), false),
     }
 }
 
+// Repo facts below can't change during one run, so each is computed by a
+// single git call and memoized for the rest of the process.
 pub fn is_git_repo() -> bool {
-    Command::new("git")
-        .args(["rev-parse", "--git-dir"])
-        .output()
-        .map(|o| o.status.success())
-        .unwrap_or(false)
+    static IS_REPO: OnceLock<bool> = OnceLock::new();
+    *IS_REPO.get_or_init(|| {
+        git_command()
+            .args(["rev-parse", "--git-dir"])
+            .output()
+            .map(|o| o.status.success())
+            .unwrap_or(false)
+    })
 }
 
 pub fn get_git_dir() -> Option<PathBuf> {
-    let output = Command::new("git")
+    let output = git_command()
         .args(["rev-parse", "--git-dir"])
         .output()
         .ok()?;
@@ -74,6 +190,11 @@ pub fn get_git_dir() -> Option<PathBuf> {
 }
 
 pub fn get_current_branch() -> String {
+    static BRANCH: OnceLock<String> = OnceLock::new();
+    BRANCH.get_or_init(current_branch).clone()
+}
+
+fn current_branch() -> String {
     if let Ok(out) = run_git(&["branch", "--show-current"]) {
         let b = out.trim().to_string();
         if !b.is_empty() {
@@ -90,12 +211,17 @@ pub fn get_current_branch() -> String {
 }
 
 pub fn get_default_branch() -> String {
-    for b in ["main", "master"] {
-        if run_git(&["rev-parse", "--verify", b]).is_ok() {
-            return b.into();
-        }
-    }
-    "main".into()
+    static DEFAULT_BRANCH: OnceLock<String> = OnceLock::new();
+    DEFAULT_BRANCH
+        .get_or_init(|| {
+            for b in ["main", "master"] {
+                if run_git(&["rev-parse", "--verify", b]).is_ok() {
+                    return b.into();
+                }
+            }
+            "main".into()
+        })
+        .clone()
 }
 
 pub fn get_commit_logs(
@@ -106,7 +232,7 @@ pub fn get_commit_logs(
 ) -> Result<Vec<CommitInfo>> {
     let mut args_vec: Vec<String> = vec![
         "log".into(),
-        "--pretty=format:%H|%an|%ad|%s".into(),
+        "--pretty=format:%H%x1f%an%x1f%ad%x1f%s%x1e".into(),
         "--date=iso".into(),
     ];
 
@@ -125,89 +251,196 @@ pub fn get_commit_logs(
 
     let args: Vec<&str> = args_vec.iter().map(|s| s.as_str()).collect();
     let output = run_git(&args)?;
+    Ok(parse_commit_logs(&output))
+}
 
-    Ok(output
-        .lines()
-        .filter(|l| !l.is_empty())
-        .filter_map(|l| {
-            let p: Vec<&str> = l.splitn(4, '|').collect();
-            if p.len() >= 4 {
-                Some(CommitInfo {
-                    hash: p[0].into(),
-                    author: p[1].into(),
-                    date: p[2].into(),
-                    message: p[3].into(),
-                })
-            } else {
-                None
+/// Parse `--pretty=format:%H%x1f%an%x1f%ad%x1f%s%x1e` output.
+pub fn parse_commit_logs(output: &str) -> Vec<CommitInfo> {
+    output
+        .split(RECORD_SEP)
+        .filter_map(|rec| {
+            let rec = rec.trim_start_matches('\n');
+            if rec.is_empty() {
+                return None;
             }
+            let mut p = rec.splitn(4, FIELD_SEP);
+            Some(CommitInfo {
+                hash: p.next()?.into(),
+                author: p.next()?.into(),
+                date: p.next()?.into(),
+                message: p.next()?.into(),
+            })
         })
-        .collect())
+        .collect()
 }
 
-pub fn get_commit_diff(hash: &str, max_chars: usize) -> Result<Option<String>> {
-    let parent_ref = format!("{}^", hash);
-    let has_parent = run_git(&["rev-parse", &parent_ref]).is_ok();
+/// Fetch diffs for many commits with a single `git log -p` call.
+///
+/// Commits without a diff (merges, or only excluded files touched) are
+/// absent from the returned map.
+pub fn get_commit_diffs(hashes: &[&str], max_chars: usize) -> Result<HashMap<String, String>> {
+    if hashes.is_empty() {
+        return Ok(HashMap::new());
+    }
+
+    let format = format!("--format={}%H", COMMIT_MARKER);
+    let args = pathspec_args(
+        &[
+            "log",
+            "-p",
+            "--unified=3",
+            "--root",
+            "--no-walk=unsorted",
+            "--stdin",
+            &format,
+        ],
+        None,
+    );
+
+    let output = run_git_with_input(&args, &hashes.join("\n"))?;
+    Ok(parse_commit_diffs(&output, max_chars))
+}
 
-    let diff = if has_parent {
-        let diff_ref = format!("{}^!", hash);
-        let mut args = vec!["diff", &diff_ref, "--unified=3", "--", "."];
-        args.extend(EXCLUDE_PATTERNS);
-        run_git(&args)?
-    } else {
-        let mut args = vec!["diff-tree", "--patch", "--unified=3", "--root", hash, "--", "."];
-        args.extend(EXCLUDE_PATTERNS);
-        run_git(&args)?
-    };
+/// Split `git log -p --format=__COMMIT__%H` output into per-commit diffs.
+pub fn parse_commit_diffs(output: &str, max_chars: usize) -> HashMap<String, String> {
+    let marker = format!("\n{}", COMMIT_MARKER);
+    let body = output.strip_prefix(COMMIT_MARKER).unwrap_or(output);
+
+    body.split(marker.as_str())
+        .filter_map(|section| {
+            let (hash, diff) = section.split_once('\n').unwrap_or((section, ""));
+            let diff = diff.trim_start_matches('\n');
+            if hash.trim().is_empty() || diff.trim().is_empty() {
+                return None;
+            }
+            Some((hash.trim().to_string(), truncate_diff(diff.to_string(), max_chars)))
+        })
+        .collect()
+}
+
+/// Argv of `base`, then `rev` if any, then the exclude pathspec, built in
+/// a single pre-sized allocation.
+fn pathspec_args<'a>(base: &[&'a str], rev: Option<&'a str>) -> Vec<&'a str> {
+    let mut args = Vec::with_capacity(base.len() + 3 + EXCLUDE_PATTERNS.len());
+    args.extend_from_slice(base);
+    args.extend(rev);
+    args.extend_from_slice(&["--", "."]);
+    args.extend_from_slice(EXCLUDE_PATTERNS);
+    args
+}
 
-    if diff.trim().is_empty() {
-        return Ok(None);
+/// Revision argument for diff commands: `--cached` wins over a target.
+fn diff_rev(target: Option<&str>, staged: bool) -> Option<&str> {
+    if staged {
+        Some("--cached")
+    } else {
+        target
     }
-    Ok(Some(truncate_diff(diff, max_chars)))
+}
+
+/// Whether the diff has any changes, via `git diff --quiet` (no output is
+/// produced and git stops at the first difference). Errors such as a bad
+/// ref count as changes so the following diff call reports them.
+pub fn has_changes(target: Option<&str>, staged: bool) -> bool {
+    let args = pathspec_args(&["diff", "--quiet"], diff_rev(target, staged));
+    git_command()
+        .args(&args)
+        .stdout(Stdio::null())
+        .stderr(Stdio::null())
+        .status()
+        .map(|s| s.code() != Some(0))
+        .unwrap_or(true)
 }
 
 pub fn get_diff(target: Option<&str>, staged: bool, max_chars: usize) -> Result<String> {
-    let mut args = vec!["diff", "--unified=3"];
-    if staged {
-        args.push("--cached");
-    } else if let Some(t) = target {
-        args.push(t);
+    let args = pathspec_args(&["diff", "--unified=3"], diff_rev(target, staged));
+    let out = run_git_bounded(&args, max_chars)?;
+    if !out.exceeded {
+        return Ok(out.text);
     }
-    args.extend(&["--", "."]);
-    args.extend(EXCLUDE_PATTERNS);
-    Ok(truncate_diff(run_git(&args)?, max_chars))
+    Ok(cut_diff(out.text, max_chars, out.last_file_start))
 }
 
 pub fn get_diff_stats(target: Option<&str>, staged: bool) -> Result<String> {
-    let mut args = vec!["diff", "--stat"];
-    if staged {
-        args.push("--cached");
-    } else if let Some(t) = target {
-        args.push(t);
-    }
+    let args = pathspec_args(&["diff", "--stat"], diff_rev(target, staged));
     run_git(&args)
 }
 
+/// Diff and its `--stat` summary from one `git diff --stat --patch` call.
+///
+/// Returns `(diff, stats)`; the stats cover the same pathspec as the diff.
+pub fn get_diff_and_stats(
+    target: Option<&str>,
+    staged: bool,
+    max_chars: usize,
+) -> Result<(String, String)> {
+    let args = pathspec_args(
+        &["diff", "--stat", "--patch", "--unified=3"],
+        diff_rev(target, staged),
+    );
+    let out = run_git_bounded(&args, max_chars)?;
+    let (stats, diff) = split_stat_patch(&out.text);
+    if !out.exceeded {
+        return Ok((diff.to_string(), stats.to_string()));
+    }
+    // Same cap as `get_diff`: the stat block counts against it and the patch
+    // gets the rest.
+    let start = out.text.len() - diff.len();
+    let last_file_start = out.last_file_start.and_then(|p| p.checked_sub(start));
+    let diff = cut_diff(diff.to_string(), max_chars.saturating_sub(start), last_file_start);
+    Ok((diff, stats.to_string()))
+}
+
+/// Split `--stat --patch` output at the first file header.
+fn split_stat_patch(output: &str) -> (&str, &str) {
+    if output.starts_with("diff --git") {
+        return ("", output);
+    }
+    match output.find(FILE_MARKER) {
+        Some(p) => (output[..p].trim_end_matches('\n'), &output[p + 1..]),
+        None => (output.trim_end_matches('\n'), ""),
+    }
+}
+
 pub fn get_current_version() -> String {
-    run_git(&["describe", "--tags", "--abbrev=0"])
-        .map(|s| s.trim().to_string())
-        .ok()
-        .filter(|s| !s.is_empty())
-        .unwrap_or_else(|| "0.0.0".into())
+    static VERSION: OnceLock<String> = OnceLock::new();
+    VERSION
+        .get_or_init(|| {
+            run_git(&["describe", "--tags", "--abbrev=0"])
+                .map(|s| s.trim().to_string())
+                .ok()
+                .filter(|s| !s.is_empty())
+                .unwrap_or_else(|| "0.0.0".into())
+        })
+        .clone()
 }
 
 pub fn truncate_diff(diff: String, max: usize) -> String {
     if diff.len() <= max {
         return diff;
     }
-    let mut t = diff[..max].to_string();
-    if let Some(p) = t.rfind("\ndiff --git") {
-        if p > max / 2 {
-            t.truncate(p);
-        }
+    let end = floor_char_boundary(&diff, max);
+    let last_file_start = diff[..end].rfind(FILE_MARKER);
+    cut_diff(diff, max, last_file_start)
+}
+
+/// Cut an over-long diff at `max`, backing up to the file boundary at
+/// `last_file_start` when that keeps more than half the budget.
+fn cut_diff(mut diff: String, max: usize, last_file_start: Option<usize>) -> String {
+    match last_file_start {
+        Some(p) if p > max / 2 => diff.truncate(p),
+        _ => diff.truncate(floor_char_boundary(&diff, max)),
     }
-    t.push_str("\n\n[... truncated ...]");
-    t
+    diff.push_str("\n\n[... truncated ...]");
+    diff
+}
+
+fn floor_char_boundary(s: &str, max: usize) -> usize {
+    let mut end = max.min(s.len());
+    while !s.is_char_boundary(end) {
+        end -= 1;
+    }
+    end
 }
 
 pub fn build_range(from: Option<&str>, to: Option<&str>, base_branch: &str) -> Option<String> {
@@ -315,6 +548,85 @@ mod tests {
         assert!(result.contains("[... truncated ...]"));
     }
 
+    #[test]
+    fn truncate_diff_respects_char_boundary() {
+        let diff = "é".repeat(10);
+        let result = truncate_diff(diff, 5);
+        assert!(result.starts_with("éé"));
+        assert!(result.contains("[... truncated ...]"));
+    }
+
+    #[test]
+    fn pathspec_args_layout() {
+        let args = pathspec_args(&["diff"], diff_rev(Some("HEAD~1"), false));
+        assert_eq!(&args[..4], &["diff", "HEAD~1", "--", "."]);
+        assert_eq!(&args[4..], EXCLUDE_PATTERNS);
+        assert_eq!(args.len(), args.capacity());
+    }
+
+    #[test]
+    fn has_changes_false_for_identical_revisions() {
+        let (_, _, has_head) = run_git_status(&["rev-parse", "--verify", "HEAD"]);
+        if has_head {
+            assert!(!has_changes(Some("HEAD..HEAD"), false));
+        }
+    }
+
+    #[test]
+    fn has_changes_true_for_bad_ref() {
+        assert!(has_changes(Some("no-such-ref-xyz..HEAD"), false));
+    }
+
+    #[test]
+    fn diff_rev_prefers_cached() {
+        assert_eq!(diff_rev(Some("HEAD~1"), true), Some("--cached"));
+        assert_eq!(diff_rev(None, false), None);
+    }
+
+    #[test]
+    fn split_stat_patch_separates_sections() {
+        let output = " a.rs | 1 +\n 1 file changed, 1 insertion(+)\n\ndiff --git a/a.rs b/a.rs\n+x\n";
+        let (stats, diff) = split_stat_patch(output);
+        assert_eq!(stats, " a.rs | 1 +\n 1 file changed, 1 insertion(+)");
+        assert_eq!(diff, "diff --git a/a.rs b/a.rs\n+x\n");
+    }
+
+    #[test]
+    fn split_stat_patch_empty_output() {
+        assert_eq!(split_stat_patch(""), ("", ""));
+    }
+
+    #[test]
+    fn cut_diff_uses_tracked_boundary() {
+        let diff = format!("{}\ndiff --git b\n{}", "a".repeat(80), "b".repeat(80));
+        let p = diff.find(FILE_MARKER);
+        assert_eq!(cut_diff(diff.clone(), 120, p), truncate_diff(diff, 120));
+    }
+
+    #[test]
+    fn cut_diff_ignores_boundary_in_first_half() {
+        let diff = format!("x\ndiff --git b\n{}", "b".repeat(200));
+        let result = cut_diff(diff, 100, Some(1));
+        assert!(result.starts_with(&format!("x\ndiff --git b\n{}", "b".repeat(50))));
+        assert!(result.ends_with("[... truncated ...]"));
+    }
+
+    #[test]
+    fn run_git_bounded_stops_at_cap() {
+        let out = run_git_bounded(&["--version"], 4).unwrap();
+        assert!(out.exceeded);
+        assert!(out.text.len() > 4);
+        assert!(out.text.starts_with("git"));
+        assert!(out.last_file_start.is_none());
+    }
+
+    #[test]
+    fn run_git_bounded_reads_all_under_cap() {
+        let out = run_git_bounded(&["--version"], usize::MAX).unwrap();
+        assert!(!out.exceeded);
+        assert!(out.text.contains("git version"));
+    }
+
     #[test]
     fn build_range_with_ref() {
         let result = build_range(Some("v1.0.0"), None, "main");
@@ -373,46 +685,75 @@ mod tests {
 
     #[test]
     fn parse_commit_log_line() {
-        let line = "abc123def|John Doe|2024-01-15 10:30:00|Fix bug in parser";
-        let parts: Vec<&str> = line.splitn(4, '|').collect();
-        assert_eq!(parts.len(), 4);
-        let info = CommitInfo {
-            hash: parts[0].into(),
-            author: parts[1].into(),
-            date: parts[2].into(),
-            message: parts[3].into(),
-        };
-        assert_eq!(info.hash, "abc123def");
-        assert_eq!(info.author, "John Doe");
+        let output = "abc123def\x1fJohn Doe\x1f2024-01-15 10:30:00\x1fFix bug in parser\x1e";
+        let commits = parse_commit_logs(output);
+        assert_eq!(commits.len(), 1);
+        assert_eq!(commits[0].hash, "abc123def");
+        assert_eq!(commits[0].author, "John Doe");
+        assert_eq!(commits[0].date, "2024-01-15 10:30:00");
+        assert_eq!(commits[0].message, "Fix bug in parser");
     }
 
     #[test]
     fn parse_commit_log_with_pipe_in_message() {
-        let line = "abc123|Author|2024-01-15|Message with | pipe | chars";
-        let parts: Vec<&str> = line.splitn(4, '|').collect();
-        assert_eq!(parts.len(), 4);
-        assert_eq!(parts[3], "Message with | pipe | chars");
+        let output = "abc123\x1fA | B\x1f2024-01-15\x1fMessage with | pipe | chars\x1e";
+        let commits = parse_commit_logs(output);
+        assert_eq!(commits[0].author, "A | B");
+        assert_eq!(commits[0].message, "Message with | pipe | chars");
     }
 
     #[test]
     fn parse_commit_log_incomplete_rejected() {
-        let line = "abc123|Author|2024-01-15";
-        let parts: Vec<&str> = line.splitn(4, '|').collect();
-        assert!(parts.len() < 4);
+        let output = "abc123\x1fAuthor\x1f2024-01-15\x1e";
+        assert!(parse_commit_logs(output).is_empty());
     }
 
     #[test]
     fn parse_empty_commit_log() {
-        let output = "";
-        let commits: Vec<&str> = output.lines().filter(|l| !l.is_empty()).collect();
-        assert!(commits.is_empty());
+        assert!(parse_commit_logs("").is_empty());
     }
 
     #[test]
-    fn parse_commit_log_filters_empty_lines() {
-        let output = "abc|author|date|msg\n\n\ndef|author2|date2|msg2\n";
-        let commits: Vec<&str> = output.lines().filter(|l| !l.is_empty()).collect();
+    fn parse_commit_log_multiple_records() {
+        let output = "abc\x1fauthor\x1fdate\x1fmsg\x1e\ndef\x1fauthor2\x1fdate2\x1fmsg2\x1e";
+        let commits = parse_commit_logs(output);
         assert_eq!(commits.len(), 2);
+        assert_eq!(commits[1].hash, "def");
+        assert_eq!(commits[1].message, "msg2");
+    }
+
+    #[test]
+    fn parse_commit_diffs_splits_by_marker() {
+        let output = "__COMMIT__aaa111\n\ndiff --git a/x.rs b/x.rs\n+x\n__COMMIT__bbb222\n\ndiff --git a/y.rs b/y.rs\n+y\n";
+        let diffs = parse_commit_diffs(output, 1000);
+        assert_eq!(diffs.len(), 2);
+        assert_eq!(diffs["aaa111"], "diff --git a/x.rs b/x.rs\n+x");
+        assert_eq!(diffs["bbb222"], "diff --git a/y.rs b/y.rs\n+y\n");
+    }
+
+    #[test]
+    fn parse_commit_diffs_skips_empty_commits() {
+        let output = "__COMMIT__aaa111\n__COMMIT__bbb222\n\ndiff --git a/y.rs b/y.rs\n+y\n";
+        let diffs = parse_commit_diffs(output, 1000);
+        assert_eq!(diffs.len(), 1);
+        assert!(diffs.contains_key("bbb222"));
+    }
+
+    #[test]
+    fn parse_commit_diffs_truncates() {
+        let output = format!("__COMMIT__aaa111\n\ndiff --git a/x.rs b/x.rs\n{}\n", "+x\n".repeat(100));
+        let diffs = parse_commit_diffs(&output, 50);
+        assert!(diffs["aaa111"].contains("[... truncated ...]"));
+    }
+
+    #[test]
+    fn parse_commit_diffs_empty_output() {
+        assert!(parse_commit_diffs("", 1000).is_empty());
+    }
+
+    #[test]
+    fn get_commit_diffs_empty_input() {
+        assert!(get_commit_diffs(&[], 1000).unwrap().is_empty());
     }
 
     #[test]
@@ -462,6 +803,25 @@ mod tests {
         assert!(patterns.iter().any(|p| p.contains(".env")));
     }
 
+    #[test]
+    fn decode_output_valid_utf8() {
+        assert_eq!(decode_output("héllo".as_bytes().to_vec()), "héllo");
+    }
+
+    #[test]
+    fn decode_output_replaces_invalid_bytes() {
+        assert_eq!(decode_output(vec![b'a', 0xff, b'b']), "a\u{fffd}b");
+    }
+
+    #[test]
+    fn git_command_sets_no_pager_and_optional_locks() {
+        let cmd = git_command();
+        assert_eq!(cmd.get_args().next(), Some(std::ffi::OsStr::new("--no-pager")));
+        assert!(cmd
+            .get_envs()
+            .any(|(k, v)| k == "GIT_OPTIONAL_LOCKS" && v == Some(std::ffi::OsStr::new("0"))));
+    }
+
     #[test]
     fn run_git_returns_result() {
         let result = run_git(&["--version"]);
@@ -506,6 +866,11 @@ mod tests {
         assert!(!branch.is_empty());
     }
 
+    #[test]
+    fn get_current_branch_is_memoized() {
+        assert_eq!(get_current_branch(), get_current_branch());
+    }
+
     #[test]
     fn get_default_branch_returns_valid() {
         let branch = get_default_branch();
@@ -1,4 +1,5 @@
 // src/main.rs
+mod cache;
 mod cli;
 mod client;
 mod commands;
@@ -7,10 +8,12 @@ mod diff;
 mod git;
 mod prompt;
 mod providers;
+mod ratelimit;
 mod types;
 
 use anyhow::{bail, Result};
 use clap::Parser;
+use std::io::IsTerminal;
 
 use cli::{Cli, Commands};
 use client::LlmClient;
@@ -74,6 +77,7 @@ async fn main() -> Result<()> {
         get_default_branch,
     );
     let client = LlmClient::new(&config)?;
+    let interactive_stream = config.stream_interactive(std::io::stdout().is_terminal());
 
     // Dispatch to command handlers
     match cli.command {
@@ -117,6 +121,9 @@ async fn main() -> Result<()> {
             until,
             limit,
             delay,
+            concurrency,
+            no_cache,
+            fast_model,
             alg,
         } => {
             cmd_history(
@@ -127,6 +134,9 @@ async fn main() -> Result<()> {
                 until,
                 limit,
                 delay,
+                concurrency,
+                !no_cache,
+                fast_model,
                 config.stream,
                 alg,
                 config.max_diff_chars,
@@ -146,7 +156,7 @@ async fn main() -> Result<()> {
                 to,
                 &config.base_branch,
                 staged,
-                config.stream,
+                interactive_stream,
                 alg,
                 config.max_diff_chars,
             )
@@ -168,7 +178,7 @@ async fn main() -> Result<()> {
                 since,
                 until,
                 limit,
-                config.stream,
+                interactive_stream,
                 alg,
                 config.max_diff_chars,
             )
@@ -191,7 +201,7 @@ async fn main() -> Result<()> {
                 until,
                 &config.base_branch,
                 staged,
-                config.stream,
+                interactive_stream,
                 alg,
                 config.max_diff_chars,
             )
@@ -210,7 +220,7 @@ async fn main() -> Result<()> {
                 to,
                 &config.base_branch,
                 current,
-                config.stream,
+                interactive_stream,
                 alg,
                 config.max_diff_chars,
             )
@@ -1,4 +1,7 @@
 // src/prompts.rs
+//
+// Providers cache identical prompt prefixes, so each user prompt keeps its
+// fixed instructions first and every {placeholder} at the end.
 
 pub const HISTORY_SYSTEM_PROMPT: &str = r#"You are an expert software engineer who writes clear, informative Git commit messages.
 
@@ -28,14 +31,14 @@ pub const HISTORY_SYSTEM_PROMPT: &str = r#"You are an expert software engineer w
 pub const HISTORY_USER_PROMPT: &str = r#"Generate a commit message for this diff.
 First line: Type(scope): only (capitalized, nothing else on this line)
 Following lines: describe what and why (1-5 lines depending on complexity)
+Respond with ONLY the commit message (no markdown, no extra explanation).
 
 **Original message (if any):** {original_message}
 
 **Diff:**
 ```
 {diff}
-```
-Respond with ONLY the commit message (no markdown, no extra explanation)."#;
+```"#;
 
 pub const COMMIT_SYSTEM_PROMPT: &str = r#"You generate clear and informative Git commit messages from diffs.
 
@@ -52,10 +55,10 @@ Examples:
 "#;
 
 pub const COMMIT_USER_PROMPT: &str = r#"Generate a commit message in a single-line.
+Respond with ONLY the commit message. (single-line)
 ```
 {diff}
-```
-Respond with ONLY the commit message. (single-line)"#;
+```"#;
 
 pub const PR_SYSTEM_PROMPT: &str = r#"Write a PR description.
 
@@ -209,6 +212,25 @@ mod tests {
         }
     }
 
+    #[test]
+    fn user_prompts_keep_instructions_before_placeholders() {
+        let prompts = [
+            HISTORY_USER_PROMPT,
+            COMMIT_USER_PROMPT,
+            PR_USER_PROMPT,
+            CHANGELOG_USER_PROMPT,
+            EXPLAIN_USER_PROMPT,
+            VERSION_USER_PROMPT,
+        ];
+        for prompt in prompts {
+            let first = prompt.find('{').unwrap();
+            assert!(
+                !prompt[first..].contains("Respond") && !prompt[first..].contains("Generate"),
+                "Static instructions should precede dynamic content"
+            );
+        }
+    }
+
     #[test]
     fn version_prompt_contains_semver() {
         assert!(VERSION_SYSTEM_PROMPT.contains("MAJOR"));
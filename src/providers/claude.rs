@@ -1,9 +1,10 @@
 // src/claude.rs
 use anyhow::{bail, Context, Result};
 use futures_util::StreamExt;
-use reqwest::Client;
+use reqwest::{Client, StatusCode};
 use std::io::{self, Write};
 
+use crate::ratelimit::{retry_after, RateLimited};
 use crate::types::*;
 
 pub async fn chat(
@@ -20,12 +21,12 @@ pub async fn chat(
     let url = format!("{}/messages", base_url);
 
     let request = ClaudeRequest {
-        model: model.to_string(),
+        model,
         messages: vec![ChatMessage {
-            role: "user".to_string(),
-            content: user.to_string(),
+            role: "user",
+            content: user,
         }],
-        system: system.to_string(),
+        system,
         max_tokens,
         temperature: Some(temperature),
         stream: Some(stream),
@@ -47,8 +48,12 @@ pub async fn chat(
         .context("Failed to send request")?;
 
     let status = response.status();
+    let retry_after = retry_after(response.headers());
     if !status.is_success() {
         let body = response.text().await.context("Failed to read error body")?;
+        if status == StatusCode::TOO_MANY_REQUESTS {
+            return Err(RateLimited::new(status, &body, retry_after).into());
+        }
         bail!("API error ({}): {}", status, body);
     }
 
@@ -163,12 +168,12 @@ mod tests {
     #[test]
     fn claude_request_builds_correctly() {
         let request = ClaudeRequest {
-            model: "claude-sonnet-4-5-20250929".to_string(),
+            model: "claude-sonnet-4-5-20250929",
             messages: vec![ChatMessage {
-                role: "user".to_string(),
-                content: "Hello".to_string(),
+                role: "user",
+                content: "Hello",
             }],
-            system: "You are helpful.".to_string(),
+            system: "You are helpful.",
             max_tokens: 1024,
             temperature: Some(0.7),
             stream: Some(false),
@@ -192,12 +197,12 @@ mod tests {
     #[test]
     fn claude_request_user_message_only() {
         let request = ClaudeRequest {
-            model: "claude-sonnet-4-5-20250929".to_string(),
+            model: "claude-sonnet-4-5-20250929",
             messages: vec![ChatMessage {
-                role: "user".to_string(),
-                content: "Test message".to_string(),
+                role: "user",
+                content: "Test message",
             }],
-            system: "System prompt".to_string(),
+            system: "System prompt",
             max_tokens: 500,
             temperature: Some(0.5),
             stream: Some(true),
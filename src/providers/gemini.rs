@@ -1,10 +1,11 @@
 // src/gemini.rs
 use anyhow::{bail, Context, Result};
 use futures_util::StreamExt;
-use reqwest::Client;
+use reqwest::{Client, StatusCode};
 use serde_json::Value;
 use std::io::{self, Write};
 
+use crate::ratelimit::{retry_after, RateLimited};
 use crate::types::*;
 
 fn normalize_base_url(base_url: &str) -> String {
@@ -50,13 +51,13 @@ pub async fn chat(
         } else {
             Some(GeminiContent {
                 parts: vec![GeminiPart {
-                    text: system.to_string(),
+                    text: system.into(),
                 }],
             })
         },
         contents: vec![GeminiContent {
             parts: vec![GeminiPart {
-                text: user.to_string(),
+                text: user.into(),
             }],
         }],
     };
@@ -77,8 +78,12 @@ pub async fn chat(
         .context("Failed to send request")?;
 
     let status = response.status();
+    let retry_after = retry_after(response.headers());
     if !status.is_success() {
         let body = response.text().await.context("Failed to read error body")?;
+        if status == StatusCode::TOO_MANY_REQUESTS {
+            return Err(RateLimited::new(status, &body, retry_after).into());
+        }
         if let Ok(err) = serde_json::from_str::<ApiError>(&body) {
             if let Some(detail) = err.error {
                 if let Some(msg) = detail.message {
@@ -341,10 +346,10 @@ mod tests {
     fn gemini_request_with_system_instruction() {
         let request = GeminiGenerateContentRequest {
             system_instruction: Some(GeminiContent {
-                parts: vec![GeminiPart { text: "You are helpful.".to_string() }],
+                parts: vec![GeminiPart { text: "You are helpful.".into() }],
             }),
             contents: vec![GeminiContent {
-                parts: vec![GeminiPart { text: "Hello".to_string() }],
+                parts: vec![GeminiPart { text: "Hello".into() }],
             }],
         };
 
@@ -358,7 +363,7 @@ mod tests {
         let request = GeminiGenerateContentRequest {
             system_instruction: None,
             contents: vec![GeminiContent {
-                parts: vec![GeminiPart { text: "Hello".to_string() }],
+                parts: vec![GeminiPart { text: "Hello".into() }],
             }],
         };
 
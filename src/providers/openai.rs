@@ -1,11 +1,12 @@
 // src/openai.rs
 use anyhow::{bail, Context, Result};
 use futures_util::StreamExt;
-use reqwest::Client;
+use reqwest::{Client, StatusCode};
 use std::collections::HashSet;
 use std::io::{self, Write};
 use std::sync::{LazyLock, Mutex};
 
+use crate::ratelimit::{retry_after, RateLimited};
 use crate::types::*;
 
 pub static REASONING_MODELS: LazyLock<Mutex<HashSet<String>>> =
@@ -28,12 +29,12 @@ pub async fn chat(
 
     let messages = vec![
         ChatMessage {
-            role: "system".to_string(),
-            content: system.to_string(),
+            role: "system",
+            content: system,
         },
         ChatMessage {
-            role: "user".to_string(),
-            content: user.to_string(),
+            role: "user",
+            content: user,
         },
     ];
 
@@ -61,7 +62,7 @@ pub async fn chat(
 
     // Non-streaming path (existing behavior)
     let request = ChatCompletionRequest {
-        model: model.to_string(),
+        model,
         messages: messages.clone(),
         max_tokens: if is_reasoning_model { None } else { Some(max_tokens) },
         max_completion_tokens: if is_reasoning_model { Some(max_tokens) } else { None },
@@ -78,7 +79,7 @@ pub async fn chat(
             REASONING_MODELS.lock().unwrap().insert(model.to_string());
 
             let retry_request = ChatCompletionRequest {
-                model: model.to_string(),
+                model,
                 messages,
                 max_tokens: None,
                 max_completion_tokens: Some(max_tokens),
@@ -96,7 +97,7 @@ async fn send_chat_request(
     http: &Client,
     url: &str,
     api_key: Option<&str>,
-    request: &ChatCompletionRequest,
+    request: &ChatCompletionRequest<'_>,
 ) -> Result<String> {
     let mut req_builder = http
         .post(url)
@@ -114,9 +115,13 @@ async fn send_chat_request(
         .context("Failed to send request")?;
 
     let status = response.status();
+    let retry_after = retry_after(response.headers());
     let body = response.text().await.context("Failed to read response body")?;
 
     if !status.is_success() {
+        if status == StatusCode::TOO_MANY_REQUESTS {
+            return Err(RateLimited::new(status, &body, retry_after).into());
+        }
         if let Ok(err) = serde_json::from_str::<ApiError>(&body) {
             if let Some(detail) = err.error {
                 if let Some(msg) = detail.message {
@@ -159,8 +164,12 @@ async fn send_chat_request_stream(
         .context("Failed to send request")?;
 
     let status = response.status();
+    let retry_after = retry_after(response.headers());
     if !status.is_success() {
         let body = response.text().await.context("Failed to read error body")?;
+        if status == StatusCode::TOO_MANY_REQUESTS {
+            return Err(RateLimited::new(status, &body, retry_after).into());
+        }
         // Keep consistent error parsing behavior
         if let Ok(err) = serde_json::from_str::<ApiError>(&body) {
             if let Some(detail) = err.error {
@@ -346,10 +355,10 @@ mod tests {
     #[test]
     fn chat_completion_request_for_normal_model() {
         let request = ChatCompletionRequest {
-            model: "gpt-4o".to_string(),
+            model: "gpt-4o",
             messages: vec![
-                ChatMessage { role: "system".to_string(), content: "test".to_string() },
-                ChatMessage { role: "user".to_string(), content: "hello".to_string() },
+                ChatMessage { role: "system", content: "test" },
+                ChatMessage { role: "user", content: "hello" },
             ],
             max_tokens: Some(500),
             max_completion_tokens: None,
@@ -364,10 +373,10 @@ mod tests {
     #[test]
     fn chat_completion_request_for_reasoning_model() {
         let request = ChatCompletionRequest {
-            model: "o1-preview".to_string(),
+            model: "o1-preview",
             messages: vec![
-                ChatMessage { role: "system".to_string(), content: "test".to_string() },
-                ChatMessage { role: "user".to_string(), content: "hello".to_string() },
+                ChatMessage { role: "system", content: "test" },
+                ChatMessage { role: "user", content: "hello" },
             ],
             max_tokens: None,
             max_completion_tokens: Some(500),
@@ -382,8 +391,8 @@ mod tests {
     #[test]
     fn openai_request_json_stream_normal_model() {
         let messages = vec![
-            ChatMessage { role: "system".to_string(), content: "sys".to_string() },
-            ChatMessage { role: "user".to_string(), content: "hi".to_string() },
+            ChatMessage { role: "system", content: "sys" },
+            ChatMessage { role: "user", content: "hi" },
         ];
 
         let v = build_chat_request_json("gpt-4o", &messages, false, 123, 0.7, true);
@@ -402,8 +411,8 @@ mod tests {
     #[test]
     fn openai_request_json_stream_reasoning_model() {
         let messages = vec![
-            ChatMessage { role: "system".to_string(), content: "sys".to_string() },
-            ChatMessage { role: "user".to_string(), content: "hi".to_string() },
+            ChatMessage { role: "system", content: "sys" },
+            ChatMessage { role: "user", content: "hi" },
         ];
 
         let v = build_chat_request_json("o1-preview", &messages, true, 999, 0.2, true);
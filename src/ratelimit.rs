@@ -0,0 +1,196 @@
+// src/ratelimit.rs
+use reqwest::header::{HeaderMap, RETRY_AFTER};
+use reqwest::StatusCode;
+use std::time::Duration;
+use tokio::sync::Mutex;
+use tokio::time::Instant;
+
+use crate::types::ApiError;
+
+/// Env vars for client-side pacing (unset = unlimited)
+pub const MAX_RPM_ENV: &str = "GITAR_MAX_RPM";
+pub const MAX_TPM_ENV: &str = "GITAR_MAX_TPM";
+
+// =============================================================================
+// TOKEN BUCKET
+// =============================================================================
+/// Paces requests against requests-per-minute and tokens-per-minute budgets
+/// so batch commands stay under the provider's limits instead of hitting 429s.
+pub struct RateLimiter {
+    rpm: f64,
+    tpm: f64,
+    buckets: Mutex<Buckets>,
+}
+
+struct Buckets {
+    requests: f64,
+    tokens: f64,
+    updated: Instant,
+}
+
+impl RateLimiter {
+    pub fn new(rpm: Option<u32>, tpm: Option<u32>) -> Option<Self> {
+        if rpm.is_none() && tpm.is_none() {
+            return None;
+        }
+        let rpm = rpm.map_or(f64::INFINITY, |n| n.max(1) as f64);
+        let tpm = tpm.map_or(f64::INFINITY, |n| n.max(1) as f64);
+        Some(Self {
+            rpm,
+            tpm,
+            buckets: Mutex::new(Buckets {
+                requests: rpm,
+                tokens: tpm,
+                updated: Instant::now(),
+            }),
+        })
+    }
+
+    pub fn from_env() -> Option<Self> {
+        let read = |var: &str| std::env::var(var).ok().and_then(|v| v.trim().parse().ok());
+        Self::new(read(MAX_RPM_ENV), read(MAX_TPM_ENV))
+    }
+
+    /// Wait until one request and `tokens` tokens fit in the budget, then take them.
+    pub async fn acquire(&self, tokens: u32) {
+        // A single request larger than the whole budget would never fit.
+        let need = (tokens as f64).min(self.tpm);
+
+        loop {
+            let wait = {
+                let mut b = self.buckets.lock().await;
+                let now = Instant::now();
+                let minutes = now.duration_since(b.updated).as_secs_f64() / 60.0;
+                b.requests = (b.requests + minutes * self.rpm).min(self.rpm);
+                b.tokens = (b.tokens + minutes * self.tpm).min(self.tpm);
+                b.updated = now;
+
+                if b.requests >= 1.0 && b.tokens >= need {
+                    b.requests -= 1.0;
+                    b.tokens -= need;
+                    return;
+                }
+
+                let req_wait = (1.0 - b.requests).max(0.0) / self.rpm;
+                let tok_wait = (need - b.tokens).max(0.0) / self.tpm;
+                Duration::from_secs_f64(req_wait.max(tok_wait) * 60.0)
+            };
+            tokio::time::sleep(wait.max(Duration::from_millis(10))).await;
+        }
+    }
+}
+
+// =============================================================================
+// 429 HANDLING
+// =============================================================================
+/// Error returned by providers on HTTP 429 so the client can back off and retry.
+#[derive(Debug)]
+pub struct RateLimited {
+    pub retry_after: Option<Duration>,
+    message: String,
+}
+
+impl RateLimited {
+    pub fn new(status: StatusCode, body: &str, retry_after: Option<Duration>) -> Self {
+        let detail = serde_json::from_str::<ApiError>(body)
+            .ok()
+            .and_then(|e| e.error)
+            .and_then(|d| d.message)
+            .unwrap_or_else(|| body.chars().take(500).collect());
+        Self {
+            retry_after,
+            message: format!("API error ({}): {}", status, detail),
+        }
+    }
+}
+
+impl std::fmt::Display for RateLimited {
+    fn fmt(&self, f: &mut std::fmt::Formatter<'_>) -> std::fmt::Result {
+        f.write_str(&self.message)
+    }
+}
+
+impl std::error::Error for RateLimited {}
+
+/// Parse a `Retry-After` header given in seconds (HTTP-date form is ignored).
+pub fn retry_after(headers: &HeaderMap) -> Option<Duration> {
+    headers
+        .get(RETRY_AFTER)
+        .and_then(|v| v.to_str().ok())
+        .and_then(|s| s.trim().parse::<f64>().ok())
+        .filter(|s| s.is_finite() && *s >= 0.0)
+        .map(Duration::from_secs_f64)
+}
+
+// =============================================================================
+// MODULE TESTS
+// =============================================================================
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn limiter_disabled_without_limits() {
+        assert!(RateLimiter::new(None, None).is_none());
+    }
+
+    #[test]
+    fn limiter_enabled_with_any_limit() {
+        assert!(RateLimiter::new(Some(60), None).is_some());
+        assert!(RateLimiter::new(None, Some(10_000)).is_some());
+    }
+
+    #[tokio::test]
+    async fn limiter_allows_burst_within_budget() {
+        let limiter = RateLimiter::new(Some(3), Some(1_000)).unwrap();
+        let start = Instant::now();
+        for _ in 0..3 {
+            limiter.acquire(100).await;
+        }
+        assert!(start.elapsed() < Duration::from_millis(500));
+    }
+
+    #[tokio::test]
+    async fn limiter_waits_when_requests_exhausted() {
+        // 600 rpm = one request every 100ms once the burst is spent
+        let limiter = RateLimiter::new(Some(600), None).unwrap();
+        for _ in 0..600 {
+            limiter.acquire(0).await;
+        }
+        let start = Instant::now();
+        limiter.acquire(0).await;
+        assert!(start.elapsed() >= Duration::from_millis(80));
+    }
+
+    #[tokio::test]
+    async fn limiter_waits_when_tokens_exhausted() {
+        // 6000 tpm = 100 tokens per second
+        let limiter = RateLimiter::new(None, Some(6_000)).unwrap();
+        limiter.acquire(6_000).await;
+        let start = Instant::now();
+        limiter.acquire(10).await;
+        assert!(start.elapsed() >= Duration::from_millis(80));
+    }
+
+    #[tokio::test]
+    async fn limiter_caps_oversized_request() {
+        let limiter = RateLimiter::new(None, Some(100)).unwrap();
+        let start = Instant::now();
+        limiter.acquire(10_000).await;
+        assert!(start.elapsed() < Duration::from_millis(500));
+    }
+
+    #[test]
+    fn rate_limited_uses_api_message() {
+        let body = r#"{"error":{"message":"Rate limit reached"}}"#;
+        let err = RateLimited::new(StatusCode::TOO_MANY_REQUESTS, body, None);
+        assert!(err.to_string().contains("Rate limit reached"));
+        assert!(err.to_string().contains("429"));
+    }
+
+    #[test]
+    fn rate_limited_falls_back_to_body() {
+        let err = RateLimited::new(StatusCode::TOO_MANY_REQUESTS, "slow down", None);
+        assert!(err.to_string().contains("slow down"));
+    }
+}
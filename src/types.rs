@@ -1,19 +1,22 @@
 // src/types.rs
 use serde::{Deserialize, Serialize};
+use std::borrow::Cow;
 
 // =============================================================================
 // OPENAI API TYPES
 // =============================================================================
-#[derive(Debug, Clone, Serialize)]
-pub struct ChatMessage {
-    pub role: String,
-    pub content: String,
+// Request types borrow the prompts: a diff can be tens of KB and is only
+// read once, by the serializer.
+#[derive(Debug, Clone, Copy, Serialize)]
+pub struct ChatMessage<'a> {
+    pub role: &'a str,
+    pub content: &'a str,
 }
 
 #[derive(Debug, Serialize)]
-pub struct ChatCompletionRequest {
-    pub model: String,
-    pub messages: Vec<ChatMessage>,
+pub struct ChatCompletionRequest<'a> {
+    pub model: &'a str,
+    pub messages: Vec<ChatMessage<'a>>,
     #[serde(skip_serializing_if = "Option::is_none")]
     pub max_tokens: Option<u32>,
     #[serde(skip_serializing_if = "Option::is_none")]
@@ -64,10 +67,10 @@ pub struct ApiErrorDetail {
 // CLAUDE API TYPES
 // =============================================================================
 #[derive(Debug, Serialize)]
-pub struct ClaudeRequest {
-    pub model: String,
-    pub messages: Vec<ChatMessage>,
-    pub system: String,
+pub struct ClaudeRequest<'a> {
+    pub model: &'a str,
+    pub messages: Vec<ChatMessage<'a>>,
+    pub system: &'a str,
     pub max_tokens: u32,
     #[serde(skip_serializing_if = "Option::is_none")]
     pub temperature: Option<f32>,
@@ -101,20 +104,21 @@ pub struct ClaudeContent {
 // GEMINI API TYPES
 // =============================================================================
 #[derive(Debug, Serialize)]
-pub struct GeminiGenerateContentRequest {
+pub struct GeminiGenerateContentRequest<'a> {
     #[serde(skip_serializing_if = "Option::is_none")]
-    pub system_instruction: Option<GeminiContent>,
-    pub contents: Vec<GeminiContent>,
+    pub system_instruction: Option<GeminiContent<'a>>,
+    pub contents: Vec<GeminiContent<'a>>,
 }
 
 #[derive(Debug, Serialize, Deserialize, Clone)]
-pub struct GeminiContent {
-    pub parts: Vec<GeminiPart>,
+pub struct GeminiContent<'a> {
+    pub parts: Vec<GeminiPart<'a>>,
 }
 
+// Borrowed when sending, owned when parsed from a response.
 #[derive(Debug, Serialize, Deserialize, Clone)]
-pub struct GeminiPart {
-    pub text: String,
+pub struct GeminiPart<'a> {
+    pub text: Cow<'a, str>,
 }
 
 #[derive(Debug, Deserialize)]
@@ -124,7 +128,7 @@ pub struct GeminiGenerateContentResponse {
 
 #[derive(Debug, Deserialize)]
 pub struct GeminiCandidate {
-    pub content: Option<GeminiContent>,
+    pub content: Option<GeminiContent<'static>>,
 }
 
 #[derive(Debug, Deserialize)]
@@ -147,8 +151,8 @@ mod tests {
     #[test]
     fn chat_message_serializes() {
         let msg = ChatMessage {
-            role: "user".to_string(),
-            content: "Hello".to_string(),
+            role: "user",
+            content: "Hello",
         };
         let json = serde_json::to_string(&msg).unwrap();
         assert!(json.contains("\"role\":\"user\""));
@@ -158,15 +162,15 @@ mod tests {
     #[test]
     fn chat_completion_request_serializes() {
         let req = ChatCompletionRequest {
-            model: "gpt-4o".to_string(),
+            model: "gpt-4o",
             messages: vec![
                 ChatMessage {
-                    role: "system".to_string(),
-                    content: "You are helpful.".to_string(),
+                    role: "system",
+                    content: "You are helpful.",
                 },
                 ChatMessage {
-                    role: "user".to_string(),
-                    content: "Hi".to_string(),
+                    role: "user",
+                    content: "Hi",
                 },
             ],
             max_tokens: Some(1024),
@@ -248,12 +252,12 @@ mod tests {
     #[test]
     fn claude_request_serializes() {
         let req = ClaudeRequest {
-            model: "claude-sonnet-4-5-20250929".to_string(),
+            model: "claude-sonnet-4-5-20250929",
             messages: vec![ChatMessage {
-                role: "user".to_string(),
-                content: "Hello".to_string(),
+                role: "user",
+                content: "Hello",
             }],
-            system: "You are helpful.".to_string(),
+            system: "You are helpful.",
             max_tokens: 1024,
             temperature: Some(0.7),
             stream: None,
@@ -270,9 +274,9 @@ mod tests {
     #[test]
     fn claude_request_skips_none_temperature() {
         let req = ClaudeRequest {
-            model: "claude-sonnet-4-5-20250929".to_string(),
+            model: "claude-sonnet-4-5-20250929",
             messages: vec![],
-            system: "test".to_string(),
+            system: "test",
             max_tokens: 500,
             temperature: None,
             stream: None,
@@ -285,12 +289,12 @@ mod tests {
     #[test]
     fn claude_request_serializes_stream_true_when_set() {
         let req = ClaudeRequest {
-            model: "claude-sonnet-4-5-20250929".to_string(),
+            model: "claude-sonnet-4-5-20250929",
             messages: vec![ChatMessage {
-                role: "user".to_string(),
-                content: "Hello".to_string(),
+                role: "user",
+                content: "Hello",
             }],
-            system: "test".to_string(),
+            system: "test",
             max_tokens: 10,
             temperature: None,
             stream: Some(true),
@@ -338,12 +342,12 @@ mod tests {
         let req = GeminiGenerateContentRequest {
             system_instruction: Some(GeminiContent {
                 parts: vec![GeminiPart {
-                    text: "You are helpful.".to_string(),
+                    text: "You are helpful.".into(),
                 }],
             }),
             contents: vec![GeminiContent {
                 parts: vec![GeminiPart {
-                    text: "Hello".to_string(),
+                    text: "Hello".into(),
                 }],
             }],
         };
@@ -360,7 +364,7 @@ mod tests {
             system_instruction: None,
             contents: vec![GeminiContent {
                 parts: vec![GeminiPart {
-                    text: "Hello".to_string(),
+                    text: "Hello".into(),
                 }],
             }],
         };
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Tests for llm.py helpers that don't touch the network: python -m unittest test_llm"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import llm
+
+
+class CachedListTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.dict(os.environ, {"XDG_CACHE_HOME": self.tmp.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+    def fetcher(self, reply):
+        calls = []
+        def fetch():
+            calls.append(1)
+            return reply
+        return fetch, calls
+
+    def test_hit_for_same_server_and_key(self):
+        fetch, calls = self.fetcher({"data": [{"id": "a"}]})
+        llm.cached_list("ollama", "http://one:11434/v1", None, fetch)
+        self.assertEqual(llm.cached_list("ollama", "http://one:11434/v1", None, fetch), {"data": [{"id": "a"}]})
+        self.assertEqual(len(calls), 1)
+
+    def test_miss_when_base_url_changes(self):
+        fetch_one, _ = self.fetcher({"data": [{"id": "a"}]})
+        llm.cached_list("ollama", "http://one:11434/v1", None, fetch_one)
+        fetch_two, calls = self.fetcher({"data": [{"id": "b"}]})
+        self.assertEqual(llm.cached_list("ollama", "http://two:11434/v1", None, fetch_two), {"data": [{"id": "b"}]})
+        self.assertEqual(len(calls), 1)
+
+    def test_miss_when_api_key_changes(self):
+        fetch_one, _ = self.fetcher({"data": []})
+        llm.cached_list("openai", "https://api.openai.com/v1", "key-1", fetch_one)
+        fetch_two, calls = self.fetcher({"data": []})
+        llm.cached_list("openai", "https://api.openai.com/v1", "key-2", fetch_two)
+        self.assertEqual(len(calls), 1)
+
+    def test_cache_file_does_not_contain_key(self):
+        path = llm.models_cache_path("openai", "https://api.openai.com/v1", "sk-secret")
+        self.assertNotIn("sk-secret", path)
+
+
+if __name__ == "__main__":
+    unittest.main()